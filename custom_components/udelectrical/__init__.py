@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import logging
+
 from homeassistant.config_entries import (
     ConfigEntry,
     ConfigEntryAuthFailed,
@@ -9,13 +11,32 @@ from homeassistant.config_entries import (
 )
 from homeassistant.const import CONF_API_KEY, CONF_HOST, Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+
+from .api import CannotConnect, InvalidAuth, UdelectricalApi
+from .const import CONF_DEDICATED_SESSION, CONF_FAST_START, CONF_SSL, DOMAIN
+from .coordinator import (
+    UdelectricalCoordinator,
+    async_get_registry,
+    async_remove_stored_data,
+    entry_key,
+)
+from .services import async_setup_services
 
-from .api import CannotConnect, UdelectricalApi
-from .const import CONF_SSL
+_LOGGER = logging.getLogger(__name__)
 
 _PLATFORMS: list[Platform] = [Platform.SENSOR]
 
-type UdelectricalConfigEntry = ConfigEntry[UdelectricalApi]
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+type UdelectricalConfigEntry = ConfigEntry[UdelectricalCoordinator]
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the udelectrical services."""
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(
@@ -29,23 +50,91 @@ async def async_setup_entry(
         ssl=entry.data.get(
             CONF_SSL, True
         ),  # Default to True for backwards compatibility
+        dedicated_session=entry.options.get(CONF_DEDICATED_SESSION, False),
     )
 
-    try:
-        if not await api.authenticate():
-            raise ConfigEntryAuthFailed("Invalid API key")
-    except CannotConnect as err:
-        raise ConfigEntryNotReady from err
+    registry = async_get_registry(hass)
+    if entry.options.get(CONF_FAST_START, False):
+        # Entities come up from the stored history and their restored state;
+        # the API is only contacted once setup has finished.
+        coordinator = await registry.async_acquire(entry, api, refresh=False)
+        entry.async_create_background_task(
+            hass, _async_fast_start(hass, entry, coordinator), f"{DOMAIN} fast start"
+        )
+    else:
+        try:
+            if not await api.authenticate():
+                raise ConfigEntryAuthFailed("Invalid API key")
+        except CannotConnect as err:
+            await api.async_close()
+            raise ConfigEntryNotReady from err
+        except ConfigEntryAuthFailed:
+            await api.async_close()
+            raise
 
-    entry.runtime_data = api
+        coordinator = await registry.async_acquire(entry, api)
+        if not coordinator.last_update_success:
+            await registry.async_release(entry)
+            raise ConfigEntryNotReady(
+                f"Unable to fetch initial data from {entry.data[CONF_HOST]}"
+            )
+
+    entry.runtime_data = coordinator
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     await hass.config_entries.async_forward_entry_setups(entry, _PLATFORMS)
 
     return True
 
 
+async def _async_fast_start(
+    hass: HomeAssistant,
+    entry: UdelectricalConfigEntry,
+    coordinator: UdelectricalCoordinator,
+) -> None:
+    """Check the API key and fetch the first data after a fast start.
+
+    A connection failure is left to the regular polling; a rejected key
+    starts the reauth flow.
+    """
+    # authenticate() reports connection failures as a rejected key, so the
+    # status endpoint is requested directly to tell the two apart.
+    try:
+        await coordinator.api._async_request("GET", "/api/status")
+    except InvalidAuth:
+        entry.async_start_reauth(hass)
+        return
+    except CannotConnect as err:
+        _LOGGER.debug("Deferring the first refresh, the API is unreachable: %s", err)
+        return
+    await coordinator.async_refresh_if_stale()
+
+
 async def async_unload_entry(
     hass: HomeAssistant, entry: UdelectricalConfigEntry
 ) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, _PLATFORMS)
+    if unload_ok := await hass.config_entries.async_unload_platforms(
+        entry, _PLATFORMS
+    ):
+        await async_get_registry(hass).async_release(entry)
+    return unload_ok
+
+
+async def async_remove_entry(
+    hass: HomeAssistant, entry: UdelectricalConfigEntry
+) -> None:
+    """Remove the entry's stored data once no other entry uses it."""
+    key = entry_key(entry)
+    if not any(
+        other.entry_id != entry.entry_id and entry_key(other) == key
+        for other in hass.config_entries.async_entries(DOMAIN)
+    ):
+        await async_remove_stored_data(hass, key)
+
+
+async def _async_update_listener(
+    hass: HomeAssistant, entry: UdelectricalConfigEntry
+) -> None:
+    """Reload the entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
@@ -0,0 +1,119 @@
+"""Rolling analytics over the daily history for the udelectrical integration."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any
+
+from .models import to_float
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ships with Home Assistant
+    np = None
+
+# Number of complete days the analytics look back over.
+WINDOW_DAYS = 30
+SHORT_WINDOW_DAYS = 7
+
+
+@dataclass(frozen=True, slots=True)
+class UdelectricalAnalytics:
+    """Analytics computed once per coordinator update.
+
+    Averages and percentiles cover complete days; the peak day share is the
+    largest day's percentage of the 30-day consumption.
+    """
+
+    average_consumption_7d: float | None
+    average_consumption_30d: float | None
+    average_price_7d: float | None
+    average_price_30d: float | None
+    weighted_price_30d: float | None
+    peak_day_share_30d: float | None
+    consumption_p50_30d: float | None
+    consumption_p90_30d: float | None
+
+
+def _percentile(values: array, q: float) -> float:
+    """Return the q-th percentile with linear interpolation."""
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def compute_analytics(
+    days: Mapping[str, dict[str, Any]], today: date
+) -> UdelectricalAnalytics | None:
+    """Compute rolling analytics from the synced daily records.
+
+    The complete days of the window are first packed into compact arrays of
+    consumption and actual price, ordered oldest first, so every figure is
+    computed in one pass over contiguous values.
+    """
+    consumption = array("d")
+    price = array("d")
+    short_start = 0
+    first_short_day = today - timedelta(days=SHORT_WINDOW_DAYS)
+    for offset in range(WINDOW_DAYS, 0, -1):
+        day = today - timedelta(days=offset)
+        record = days.get(day.isoformat())
+        if isinstance(record, dict):
+            value = to_float(record.get("consumption"))
+            day_price = to_float(record.get("actual_price"))
+            if value is not None and day_price is not None:
+                consumption.append(value)
+                price.append(day_price)
+        if day < first_short_day:
+            short_start = len(consumption)
+    if not consumption:
+        return None
+
+    if np is not None:
+        c = np.frombuffer(consumption, dtype=np.float64)
+        p = np.frombuffer(price, dtype=np.float64)
+        total = float(c.sum())
+        short = c[short_start:]
+        average_consumption_7d = float(short.mean()) if short.size else None
+        average_price_7d = float(p[short_start:].mean()) if short.size else None
+        average_consumption_30d = float(c.mean())
+        average_price_30d = float(p.mean())
+        weighted = float((c * p).sum()) / total if total else None
+        peak = float(c.max()) / total * 100 if total else None
+        p50, p90 = (float(value) for value in np.percentile(c, (50, 90)))
+    else:
+        total = sum(consumption)
+        short_count = len(consumption) - short_start
+        average_consumption_7d = (
+            sum(consumption[short_start:]) / short_count if short_count else None
+        )
+        average_price_7d = (
+            sum(price[short_start:]) / short_count if short_count else None
+        )
+        average_consumption_30d = total / len(consumption)
+        average_price_30d = sum(price) / len(price)
+        weighted = (
+            sum(c * p for c, p in zip(consumption, price, strict=True)) / total
+            if total
+            else None
+        )
+        peak = max(consumption) / total * 100 if total else None
+        p50 = _percentile(consumption, 50)
+        p90 = _percentile(consumption, 90)
+
+    return UdelectricalAnalytics(
+        average_consumption_7d=average_consumption_7d,
+        average_consumption_30d=average_consumption_30d,
+        average_price_7d=average_price_7d,
+        average_price_30d=average_price_30d,
+        weighted_price_30d=weighted,
+        peak_day_share_30d=peak,
+        consumption_p50_30d=p50,
+        consumption_p90_30d=p90,
+    )
+
@@ -3,16 +3,62 @@
 from __future__ import annotations
 
 import asyncio
+import codecs
+from collections.abc import AsyncIterator
+from email.utils import parsedate_to_datetime
+import json
+from logging import DEBUG
+import random
+import time
 from typing import Any
 
 import aiohttp
+from aiohttp.compression_utils import HAS_BROTLI
 
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+from homeassistant.util.ssl import client_context
+
+from .const import DATA_CIRCUIT_BREAKERS, DATA_SHARED_REQUESTS
+from .metrics import UdelectricalMetrics
+from .models import StatisticsRow
 
 _LOGGER = __import__("logging").getLogger(__name__)
 
+# Upper bound for a single response body; statistics ranges are the largest
+# payloads this API returns and stay well below this for normal use.
+_MAX_RESPONSE_BYTES = 8 * 1024 * 1024
+_READ_CHUNK_BYTES = 64 * 1024
+
+# A stream that stays silent longer than this is considered dropped.
+_STREAM_READ_TIMEOUT = 300
+
+# Upper bound for a single record of a streamed response; a larger unparsed
+# remainder means the body is not a JSON array of records.
+_MAX_RECORD_BYTES = 64 * 1024
+
+# Retry policy for idempotent requests; delays are in seconds.
+_MAX_ATTEMPTS = 3
+_BACKOFF_BASE = 1.0
+_BACKOFF_MAX = 30.0
+
+# Circuit breaker policy; times are in seconds.
+_BREAKER_THRESHOLD = 5
+_BREAKER_RESET = 60.0
+_BREAKER_RESET_MAX = 900.0
+
+# Connection pool settings for a dedicated session.
+_CONNECTION_LIMIT = 4
+_KEEPALIVE_TIMEOUT = 60.0
+_DNS_CACHE_TTL = 300
+
+# Seconds a GET response is reused for identical requests without a new call.
+_MICRO_CACHE_TTL = 5.0
+
 
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect to the UDElectrical API."""
@@ -22,6 +68,19 @@ class CannotConnect(HomeAssistantError):
         super().__init__(message)
 
 
+class ServerUnavailable(CannotConnect):
+    """Error to indicate a transient failure that is worth retrying."""
+
+    def __init__(
+        self,
+        message: str = "The UDElectrical API is unavailable",
+        retry_after: float | None = None,
+    ) -> None:
+        """Initialize ServerUnavailable with an optional Retry-After delay."""
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 class InvalidAuth(HomeAssistantError):
     """Error to indicate there is invalid authentication for the UDElectrical API."""
 
@@ -32,52 +91,515 @@ class InvalidAuth(HomeAssistantError):
         super().__init__(message)
 
 
+def _parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((retry_at - dt_util.utcnow()).total_seconds(), 0.0)
+
+
+class CircuitBreaker:
+    """Short-circuit requests to a host that is known to be unhealthy.
+
+    The breaker opens after a run of consecutive transient failures, or for
+    the delay requested by a Retry-After header. Once the open period ends a
+    request is let through; another failure reopens the breaker for twice as
+    long, up to a maximum, while a success closes it.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a closed circuit breaker."""
+        self._failures = 0
+        self._open_until = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        """Return True if requests should be short-circuited."""
+        return time.monotonic() < self._open_until
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful request."""
+        self._failures = 0
+        self._open_until = 0.0
+
+    def record_failure(self, retry_after: float | None = None) -> None:
+        """Count a transient failure and open the breaker when warranted."""
+        self._failures += 1
+        now = time.monotonic()
+        if retry_after is not None:
+            self._open_until = max(self._open_until, now + retry_after)
+        if self._failures >= _BREAKER_THRESHOLD:
+            open_for = min(
+                _BREAKER_RESET * 2 ** (self._failures - _BREAKER_THRESHOLD),
+                _BREAKER_RESET_MAX,
+            )
+            self._open_until = max(self._open_until, now + open_for)
+
+
+class SharedRequests:
+    """GET requests shared by every API client of one host and API key.
+
+    Kept in hass.data, so the clients of the config flow, the setup and a
+    reload coalesce with each other, not just with themselves.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without requests."""
+        self.in_flight: dict[str, asyncio.Task[Any]] = {}
+        # url -> (monotonic time of the response, parsed body)
+        self.recent: dict[str, tuple[float, Any]] = {}
+
+
 class UdelectricalApi:
     """API client for udelectrical."""
 
     def __init__(
-        self, hass: HomeAssistant, host: str, api_key: str, ssl: bool = True
+        self,
+        hass: HomeAssistant,
+        host: str,
+        api_key: str,
+        ssl: bool = True,
+        dedicated_session: bool = False,
     ) -> None:
-        """Initialize API client."""
-        self._session = async_get_clientsession(hass)
+        """Initialize API client.
+
+        With dedicated_session the client gets its own connection pool to the
+        host instead of Home Assistant's shared session; it must then be
+        closed with async_close, and is closed when Home Assistant stops.
+        """
         self._host = host
         self._api_key = api_key
         self._ssl = ssl
+        self._base_url = f"{'https' if ssl else 'http'}://{host}"
+        self._owns_session = dedicated_session
+        self._unsub_close: CALLBACK_TYPE | None = None
+        if dedicated_session:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=_CONNECTION_LIMIT,
+                    ttl_dns_cache=_DNS_CACHE_TTL,
+                    keepalive_timeout=_KEEPALIVE_TIMEOUT,
+                    ssl=client_context() if ssl else False,
+                )
+            )
+            self._unsub_close = hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_CLOSE, self._async_close_on_stop
+            )
+        else:
+            self._session = async_get_clientsession(hass)
         self._headers = {
             "X-API-Key": api_key,
             "Accept": "application/json",
+            "Accept-Encoding": "gzip, br" if HAS_BROTLI else "gzip, deflate",
         }
+        # (method, path) -> (url, etag, last_modified, parsed body). Only the
+        # latest response per endpoint is kept: URLs carry dates, so keying on
+        # the full URL would grow the cache without bound.
+        self._response_cache: dict[
+            tuple[str, str], tuple[str, str | None, str | None, Any]
+        ] = {}
+        self.metrics = UdelectricalMetrics()
+        self._breaker: CircuitBreaker = hass.data.setdefault(
+            DATA_CIRCUIT_BREAKERS, {}
+        ).setdefault(host, CircuitBreaker())
+        self._shared: SharedRequests = hass.data.setdefault(
+            DATA_SHARED_REQUESTS, {}
+        ).setdefault((self._base_url, api_key), SharedRequests())
+        # Shared requests this client started; they use its session.
+        self._started: set[asyncio.Task[Any]] = set()
 
     async def _async_request(
         self, method: str, url: str, **kwargs: Any
     ) -> dict[str, Any]:
-        """Make an API request."""
+        """Make an API request, sharing identical concurrent GET requests.
+
+        Concurrent GETs for the same URL await a single in-flight request, and
+        its response is reused for identical GETs made within a few seconds.
+        Both are shared with the other clients of the same host and API key;
+        see SharedRequests.
+        """
+        if method != "GET" or kwargs:
+            return await self._async_request_with_retry(method, url, **kwargs)
+
+        shared = self._shared
+        now = time.monotonic()
+        if (recent := shared.recent.get(url)) is not None:
+            if now - recent[0] < _MICRO_CACHE_TTL:
+                return recent[1]
+            del shared.recent[url]
+
+        if (task := shared.in_flight.get(url)) is None:
+            task = shared.in_flight[url] = asyncio.get_running_loop().create_task(
+                self._async_request_with_retry(method, url)
+            )
+            self._started.add(task)
+            task.add_done_callback(lambda done: self._async_request_done(url, done))
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # The client that started the request was closed; only a
+            # cancellation of this caller itself is passed on as such.
+            current = asyncio.current_task()
+            if not task.cancelled() or (current is not None and current.cancelling()):
+                raise
+            raise CannotConnect(f"Request to {self._host} was cancelled") from None
+
+    def _async_request_done(self, url: str, task: asyncio.Task[Any]) -> None:
+        """Remember the response of a finished shared request."""
+        shared = self._shared
+        self._started.discard(task)
+        del shared.in_flight[url]
+        if task.cancelled():
+            return
+        # Retrieve the exception so it is not reported when nobody awaits it.
+        if task.exception() is None:
+            now = time.monotonic()
+            shared.recent = {
+                key: recent
+                for key, recent in shared.recent.items()
+                if now - recent[0] < _MICRO_CACHE_TTL
+            }
+            shared.recent[url] = (now, task.result())
+
+    async def _async_request_with_retry(
+        self, method: str, url: str, **kwargs: Any
+    ) -> dict[str, Any]:
+        """Make an API request, retrying transient failures of GET requests.
+
+        Retries use jittered exponential backoff, or the Retry-After delay the
+        API asked for. Requests fail immediately while the host's circuit
+        breaker is open.
+        """
+        attempts = _MAX_ATTEMPTS if method == "GET" else 1
+        attempt = 0
+        while True:
+            attempt += 1
+            if self._breaker.is_open:
+                raise CannotConnect(
+                    f"Skipping request to {self._host}, the API is unavailable"
+                )
+            try:
+                data = await self._async_request_once(method, url, **kwargs)
+            except ServerUnavailable as err:
+                self._breaker.record_failure(err.retry_after)
+                if err.retry_after is not None:
+                    delay = err.retry_after
+                else:
+                    delay = random.uniform(
+                        0, min(_BACKOFF_BASE * 2 ** (attempt - 1), _BACKOFF_MAX)
+                    )
+                if attempt == attempts or delay > _BACKOFF_MAX:
+                    raise
+                _LOGGER.debug(
+                    "Request to %s failed, retrying in %.1f seconds: %s",
+                    url,
+                    delay,
+                    err,
+                )
+                await asyncio.sleep(delay)
+            else:
+                self._breaker.record_success()
+                return data
+
+    async def _async_request_once(
+        self, method: str, url: str, **kwargs: Any
+    ) -> dict[str, Any]:
+        """Make a single API request.
+
+        The latest response per method and endpoint carrying an ETag or
+        Last-Modified validator is cached. A later request for the same URL is
+        made conditional so that a 304 returns the cached parsed body without
+        transferring it again.
+        """
+        cache_key = (method, url.partition("?")[0])
+        headers = self._headers
+        cached = self._response_cache.get(cache_key)
+        if cached is not None and cached[0] != url:
+            cached = None
+        if cached is not None:
+            _, etag, last_modified, _ = cached
+            headers = dict(self._headers)
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        metrics = self.metrics.endpoint(url)
+        started = time.perf_counter()
         try:
             async with asyncio.timeout(10):
-                protocol = "https" if self._ssl else "http"
                 response = await self._session.request(
                     method,
-                    f"{protocol}://{self._host}{url}",
+                    f"{self._base_url}{url}",
                     **kwargs,
-                    headers=self._headers,
+                    headers=headers,
                 )
+                metrics.record_latency(time.perf_counter() - started)
 
-                _LOGGER.debug(
-                    "udelectrical API response [%s] %s: %s",
-                    response.status,
-                    url,
-                    await response.text(),
-                )
+                if response.status == 304 and cached is not None:
+                    _LOGGER.debug(
+                        "udelectrical API response [304] %s: not modified", url
+                    )
+                    metrics.successes += 1
+                    metrics.not_modified += 1
+                    return cached[3]
+
+                body = await self._async_read_body(response)
+                if _LOGGER.isEnabledFor(DEBUG):
+                    _LOGGER.debug(
+                        "udelectrical API response [%s] %s: %s",
+                        response.status,
+                        url,
+                        body.decode(response.get_encoding(), errors="replace"),
+                    )
                 if response.status == 401:
                     raise InvalidAuth("Invalid API key")
+                if response.status in (429, 503):
+                    raise ServerUnavailable(
+                        f"API asked to back off ({response.status})",
+                        _parse_retry_after(
+                            response.headers.get(aiohttp.hdrs.RETRY_AFTER)
+                        ),
+                    )
+                if response.status >= 500:
+                    raise ServerUnavailable(f"API server error ({response.status})")
 
                 response.raise_for_status()
-                return await response.json()
+                parse_started = time.perf_counter()
+                try:
+                    data = json_loads(body)
+                except ValueError as err:
+                    raise CannotConnect(f"Invalid JSON response from {url}") from err
+                metrics.record_response(
+                    len(body), time.perf_counter() - parse_started
+                )
 
+                etag = response.headers.get(aiohttp.hdrs.ETAG)
+                last_modified = response.headers.get(aiohttp.hdrs.LAST_MODIFIED)
+                if etag or last_modified:
+                    self._response_cache[cache_key] = (url, etag, last_modified, data)
+                else:
+                    self._response_cache.pop(cache_key, None)
+                metrics.successes += 1
+                return data
+
+        except (CannotConnect, InvalidAuth):
+            metrics.failures += 1
+            raise
+        except aiohttp.ClientConnectionError as err:
+            metrics.failures += 1
+            raise ServerUnavailable(str(err) or "Cannot connect to API") from err
         except aiohttp.ClientError as err:
+            metrics.failures += 1
             raise CannotConnect from err
         except TimeoutError as err:
-            raise CannotConnect("Timeout connecting to API") from err
+            metrics.timeouts += 1
+            raise ServerUnavailable("Timeout connecting to API") from err
+
+    @staticmethod
+    async def _async_read_body(response: aiohttp.ClientResponse) -> bytes:
+        """Read the response body once, refusing bodies above the size cap."""
+        if (
+            response.content_length is not None
+            and response.content_length > _MAX_RESPONSE_BYTES
+        ):
+            raise CannotConnect(
+                f"Response too large ({response.content_length} bytes)"
+            )
+        chunks: list[bytes] = []
+        size = 0
+        async for chunk in response.content.iter_chunked(_READ_CHUNK_BYTES):
+            size += len(chunk)
+            if size > _MAX_RESPONSE_BYTES:
+                raise CannotConnect(f"Response exceeds {_MAX_RESPONSE_BYTES} bytes")
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    async def async_stream_latest(self) -> AsyncIterator[Any]:
+        """Yield readings pushed as server-sent events by /api/consumption/latest.
+
+        Raises CannotConnect when the stream cannot be opened, is not
+        supported by the backend or drops.
+        """
+        headers = {**self._headers, "Accept": "text/event-stream"}
+        try:
+            async with self._session.get(
+                f"{self._base_url}/api/consumption/latest",
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(
+                    total=None, sock_connect=10, sock_read=_STREAM_READ_TIMEOUT
+                ),
+            ) as response:
+                if response.status == 401:
+                    raise InvalidAuth("Invalid API key")
+                response.raise_for_status()
+                if response.content_type != "text/event-stream":
+                    raise CannotConnect("Streaming is not supported by the API")
+
+                data_lines: list[str] = []
+                async for raw_line in response.content:
+                    line = raw_line.decode("utf-8").rstrip("\r\n")
+                    if not line:
+                        if data_lines:
+                            yield json_loads("\n".join(data_lines))
+                            data_lines = []
+                        continue
+                    name, _, value = line.partition(":")
+                    if name == "data":
+                        data_lines.append(value.removeprefix(" "))
+        except aiohttp.ClientError as err:
+            raise CannotConnect from err
+        except TimeoutError as err:
+            raise CannotConnect("Stream timed out") from err
+        except ValueError as err:
+            raise CannotConnect("Invalid JSON in stream") from err
+        raise CannotConnect("Stream closed by the API")
+
+    async def async_stream_rows(
+        self, url: str, field: str
+    ) -> AsyncIterator[StatisticsRow]:
+        """Yield the records of a JSON array response as compact rows.
+
+        The body is decoded chunk by chunk and each record is converted as
+        soon as it is complete, so memory use does not grow with the range
+        requested. field names the record's period field. Streamed requests
+        bypass the response caches and are not retried, as rows may already
+        have been consumed; the caller resumes instead.
+        """
+        if self._breaker.is_open:
+            raise CannotConnect(
+                f"Skipping request to {self._host}, the API is unavailable"
+            )
+        metrics = self.metrics.endpoint(url)
+        started = time.perf_counter()
+        decoder = json.JSONDecoder()
+        text = codecs.getincrementaldecoder("utf-8")()
+        buffer = ""
+        opened = closed = False
+        size = 0
+        parse_time = 0.0
+        try:
+            async with self._session.get(
+                f"{self._base_url}{url}",
+                headers=self._headers,
+                timeout=aiohttp.ClientTimeout(
+                    total=None, sock_connect=10, sock_read=_STREAM_READ_TIMEOUT
+                ),
+            ) as response:
+                metrics.record_latency(time.perf_counter() - started)
+                if response.status == 401:
+                    raise InvalidAuth("Invalid API key")
+                if response.status in (429, 503) or response.status >= 500:
+                    raise ServerUnavailable(
+                        f"API server error ({response.status})",
+                        _parse_retry_after(
+                            response.headers.get(aiohttp.hdrs.RETRY_AFTER)
+                        ),
+                    )
+                response.raise_for_status()
+
+                async for chunk in response.content.iter_chunked(_READ_CHUNK_BYTES):
+                    size += len(chunk)
+                    parse_started = time.perf_counter()
+                    buffer += text.decode(chunk)
+                    rows: list[StatisticsRow] = []
+                    pos = 0
+                    while not closed:
+                        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                            pos += 1
+                        if pos == len(buffer):
+                            break
+                        if not opened:
+                            if buffer[pos] != "[":
+                                raise ValueError("Expected a JSON array")
+                            opened = True
+                            pos += 1
+                            continue
+                        if buffer[pos] == "]":
+                            closed = True
+                            break
+                        try:
+                            record, pos = decoder.raw_decode(buffer, pos)
+                        except json.JSONDecodeError:
+                            # The record continues in the next chunk.
+                            break
+                        if isinstance(record, dict):
+                            rows.append(StatisticsRow.from_record(record, field))
+                    buffer = buffer[pos:]
+                    if len(buffer) > _MAX_RECORD_BYTES:
+                        raise ValueError("Record too large")
+                    parse_time += time.perf_counter() - parse_started
+                    for row in rows:
+                        yield row
+                if not closed:
+                    raise ValueError("Truncated JSON array")
+        except ServerUnavailable as err:
+            metrics.failures += 1
+            self._breaker.record_failure(err.retry_after)
+            raise
+        except (CannotConnect, InvalidAuth):
+            metrics.failures += 1
+            raise
+        except aiohttp.ClientConnectionError as err:
+            metrics.failures += 1
+            self._breaker.record_failure()
+            raise CannotConnect(str(err) or "Cannot connect to API") from err
+        except aiohttp.ClientError as err:
+            # Like other requests, only count transient failures.
+            metrics.failures += 1
+            raise CannotConnect(str(err) or "Cannot connect to API") from err
+        except TimeoutError as err:
+            metrics.timeouts += 1
+            self._breaker.record_failure()
+            raise CannotConnect("Timeout reading from API") from err
+        except ValueError as err:
+            metrics.failures += 1
+            raise CannotConnect(f"Invalid JSON response from {url}") from err
+        self._breaker.record_success()
+        metrics.record_response(size, parse_time)
+        metrics.successes += 1
+
+    def validators(self, url: str) -> tuple[str | None, str | None, Any] | None:
+        """Return the ETag, Last-Modified and parsed body cached for a GET."""
+        cached = self._response_cache.get(("GET", url.partition("?")[0]))
+        if cached is None or cached[0] != url:
+            return None
+        return cached[1:]
+
+    def restore_validators(
+        self, url: str, etag: str | None, last_modified: str | None, data: Any
+    ) -> None:
+        """Seed the conditional request cache for a GET, e.g. after a restart."""
+        if etag or last_modified:
+            self._response_cache[("GET", url.partition("?")[0])] = (
+                url,
+                etag,
+                last_modified,
+                data,
+            )
+
+    async def _async_close_on_stop(self, event: Event) -> None:
+        """Close the dedicated session when Home Assistant stops."""
+        self._unsub_close = None
+        await self._session.close()
+
+    async def async_close(self) -> None:
+        """Cancel shared requests this client started and close an owned session."""
+        if tasks := list(self._started):
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if self._unsub_close is not None:
+            self._unsub_close()
+            self._unsub_close = None
+        if self._owns_session:
+            await self._session.close()
 
     async def authenticate(self) -> bool:
         """Test if we can authenticate with the host."""
@@ -0,0 +1,87 @@
+"""Persisted coordinator payload for warm restarts of the udelectrical integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .models import UdelectricalSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+
+@dataclass(frozen=True, slots=True)
+class CachedPayload:
+    """The last coordinator payload and what it was synced against.
+
+    The snapshot carries its fetch times. latest and day are the
+    /api/consumption/latest reading and the local day the statistics were
+    last synced for; etag and last_modified are the validators of that
+    reading's response.
+    """
+
+    snapshot: UdelectricalSnapshot
+    latest: Any
+    day: str | None
+    etag: str | None
+    last_modified: str | None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the payload in its stored form."""
+        return {
+            "snapshot": asdict(self.snapshot),
+            "latest": self.latest,
+            "day": self.day,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+        }
+
+
+class UdelectricalPayloadCache:
+    """Store the normalized coordinator payload across restarts.
+
+    Writes are debounced, so a burst of updates results in a single write.
+    A stored payload that no longer matches the snapshot layout is ignored.
+    """
+
+    def __init__(self, hass: HomeAssistant, key: str) -> None:
+        """Initialize the payload cache."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.payload.{key}"
+        )
+
+    async def async_load(self) -> CachedPayload | None:
+        """Load the stored payload, if any."""
+        if (data := await self._store.async_load()) is None:
+            return None
+        try:
+            return CachedPayload(
+                snapshot=UdelectricalSnapshot.from_dict(data["snapshot"]),
+                latest=data["latest"],
+                day=data["day"],
+                etag=data["etag"],
+                last_modified=data["last_modified"],
+            )
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.debug("Ignoring the stored udelectrical payload: %s", err)
+            return None
+
+    def async_schedule_save(
+        self, payload_func: Callable[[], CachedPayload | None]
+    ) -> None:
+        """Save the payload returned by payload_func after the save delay."""
+
+        def _data_to_save() -> dict[str, Any] | None:
+            payload = payload_func()
+            return None if payload is None else payload.as_dict()
+
+        self._store.async_delay_save(_data_to_save, SAVE_DELAY)
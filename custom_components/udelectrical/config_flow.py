@@ -1,14 +1,28 @@
 """Config flow for UDElectrical integration."""
 
 from __future__ import annotations
+from collections.abc import Mapping
 from typing import Any
 
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST
+from homeassistant.core import callback
 
 from .api import UdelectricalApi, CannotConnect, InvalidAuth
-from .const import DOMAIN, CONF_SSL
+from .const import (
+    DOMAIN,
+    CONF_ATTRIBUTE_INTERVAL,
+    CONF_DEDICATED_SESSION,
+    CONF_FAST_START,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_PUSH_UPDATES,
+    CONF_SSL,
+    DEFAULT_ATTRIBUTE_INTERVAL,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+)
 
 CONF_API_KEY = "api_key"
 _LOGGER = __import__("logging").getLogger(__name__)
@@ -20,6 +34,14 @@ class UDElectricalConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
     MINOR_VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> UDElectricalOptionsFlow:
+        """Get the options flow for this handler."""
+        return UDElectricalOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> config_entries.ConfigFlowResult:
@@ -46,8 +68,8 @@ class UDElectricalConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 if not authenticated:
                     errors["base"] = "invalid_auth"
                 else:
-                    await self.async_set_unique_id(f"udelectrical_{host}")
-                    self._abort_if_unique_id_configured()
+                    # No unique id: entries for the same host may differ in
+                    # API key, and identical ones share a coordinator.
                     return self.async_create_entry(
                         title=host,
                         data={CONF_HOST: host, CONF_API_KEY: api_key, CONF_SSL: ssl},
@@ -66,16 +88,22 @@ class UDElectricalConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
     async def async_step_reauth(
+        self, entry_data: Mapping[str, Any]
+    ) -> config_entries.ConfigFlowResult:
+        """Handle a rejected API key."""
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(
         self, user_input: dict[str, Any] | None = None
     ) -> config_entries.ConfigFlowResult:
         """Handle re-authentication with updated credentials."""
         errors = {}
-        host = self.context.get("host") or self.context.get("unique_id")
-        if user_input is not None and host:
+        entry = self._get_reauth_entry()
+        if user_input is not None:
             api_key = user_input[CONF_API_KEY]
             ssl = user_input.get(CONF_SSL, True)  # Default to True
             try:
-                api = UdelectricalApi(self.hass, str(host), api_key, ssl)
+                api = UdelectricalApi(self.hass, entry.data[CONF_HOST], api_key, ssl)
                 authenticated = await api.authenticate()
             except CannotConnect:
                 errors["base"] = "cannot_connect"
@@ -85,23 +113,12 @@ class UDElectricalConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 if not authenticated:
                     errors["base"] = "invalid_auth"
                 else:
-                    # Find the config entry to update
-                    entry = next(
-                        (
-                            e
-                            for e in self._async_current_entries()
-                            if e.unique_id == f"udelectrical_{host}"
-                        ),
-                        None,
+                    return self.async_update_reload_and_abort(
+                        entry,
+                        data_updates={CONF_API_KEY: api_key, CONF_SSL: ssl},
                     )
-                    if entry is not None:
-                        return self.async_update_reload_and_abort(
-                            entry,
-                            data_updates={CONF_API_KEY: api_key, CONF_SSL: ssl},
-                        )
-                    errors["base"] = "unknown"
         return self.async_show_form(
-            step_id="reauth",
+            step_id="reauth_confirm",
             data_schema=vol.Schema(
                 {
                     vol.Required(CONF_API_KEY): str,
@@ -110,3 +127,54 @@ class UDElectricalConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             ),
             errors=errors,
         )
+
+
+class UDElectricalOptionsFlow(config_entries.OptionsFlow):
+    """Handle UDElectrical options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Manage the options."""
+        errors = {}
+        if user_input is not None:
+            if user_input[CONF_MIN_INTERVAL] > user_input[CONF_MAX_INTERVAL]:
+                errors["base"] = "invalid_interval"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_PUSH_UPDATES,
+                        default=options.get(CONF_PUSH_UPDATES, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_MIN_INTERVAL,
+                        default=options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+                    vol.Optional(
+                        CONF_MAX_INTERVAL,
+                        default=options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+                    vol.Optional(
+                        CONF_ATTRIBUTE_INTERVAL,
+                        default=options.get(
+                            CONF_ATTRIBUTE_INTERVAL, DEFAULT_ATTRIBUTE_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
+                    vol.Optional(
+                        CONF_DEDICATED_SESSION,
+                        default=options.get(CONF_DEDICATED_SESSION, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_FAST_START,
+                        default=options.get(CONF_FAST_START, False),
+                    ): bool,
+                }
+            ),
+            errors=errors,
+        )
@@ -2,3 +2,36 @@
 
 DOMAIN = "udelectrical"
 CONF_SSL = "ssl"
+CONF_PUSH_UPDATES = "push_updates"
+CONF_MIN_INTERVAL = "min_interval"
+CONF_MAX_INTERVAL = "max_interval"
+CONF_ATTRIBUTE_INTERVAL = "attribute_interval"
+CONF_DEDICATED_SESSION = "dedicated_session"
+CONF_FAST_START = "fast_start"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+
+# Days of history fetched on the first sync of a new installation.
+HISTORY_LOOKBACK_DAYS = 365
+
+# Reconnect backoff for the push stream, in seconds.
+PUSH_RETRY_MIN = 5
+PUSH_RETRY_MAX = 600
+
+# Bounds for the adaptive update interval, in minutes.
+DEFAULT_MIN_INTERVAL = 5
+DEFAULT_MAX_INTERVAL = 60
+
+# Minimum minutes between state writes that only change attributes.
+DEFAULT_ATTRIBUTE_INTERVAL = 60
+
+# hass.data key for the per-host circuit breakers.
+DATA_CIRCUIT_BREAKERS = f"{DOMAIN}_circuit_breakers"
+
+# hass.data key for the GET requests shared by the API clients of a host
+# and API key.
+DATA_SHARED_REQUESTS = f"{DOMAIN}_shared_requests"
+
+# Dispatcher signal sent after each update cycle, formatted with the
+# coordinator's storage key.
+SIGNAL_METRICS_UPDATED = f"{DOMAIN}_metrics_updated_{{}}"
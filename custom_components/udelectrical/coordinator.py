@@ -3,81 +3,569 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import timedelta
+from dataclasses import dataclass, field, replace
+from datetime import date, timedelta
+import hashlib
 import logging
+import time
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_KEY, CONF_HOST
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util, slugify
 
-from .api import UdelectricalApi, CannotConnect
-from .const import DOMAIN
+from .api import UdelectricalApi, CannotConnect, InvalidAuth
+from .const import (
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_PUSH_UPDATES,
+    CONF_SSL,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    DOMAIN,
+    HISTORY_LOOKBACK_DAYS,
+    PUSH_RETRY_MAX,
+    PUSH_RETRY_MIN,
+    SIGNAL_METRICS_UPDATED,
+)
+from .cache import CachedPayload, UdelectricalPayloadCache
+from .forecast import UdelectricalForecaster
+from .history import DAY_FORMAT, MONTH_FORMAT, UdelectricalHistory
+from .models import (
+    ENDPOINT_DAYS,
+    ENDPOINT_MONTHS,
+    Granularity,
+    UdelectricalSnapshot,
+    to_float,
+)
+from .range_cache import UdelectricalRangeCache
+from .readings import UdelectricalReadings
 from datetime import datetime
 
 _LOGGER = logging.getLogger(__name__)
 
+# Weight of the newest observation in the ingestion cadence estimate.
+_CADENCE_WEIGHT = 0.3
+# Delay after the expected ingestion time before polling for it.
+_CADENCE_MARGIN = 60
 
-from typing import Any
+_LATEST_URL = "/api/consumption/latest"
 
+# Kinds of .storage files kept per coordinator, as udelectrical.<kind>.<key>.
+_STORAGE_KINDS = ("history", "payload", "forecast", "readings", "statistics")
 
-class UdelectricalCoordinator(DataUpdateCoordinator[dict[str, Any] | None]):
-    """Coordinator for udelectrical data updates."""
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .statistics import UdelectricalStatisticsImporter
+
+
+class UdelectricalCoordinator(DataUpdateCoordinator[UdelectricalSnapshot | None]):
+    """Coordinator for udelectrical data updates.
+
+    One coordinator serves every config entry with the same host, SSL
+    setting and API key, so it is not bound to a single config entry; see
+    UdelectricalRegistry.
+    """
 
     def __init__(
-        self, hass: HomeAssistant, api: UdelectricalApi, entry: ConfigEntry
+        self,
+        hass: HomeAssistant,
+        api: UdelectricalApi,
+        host: str,
+        key: str,
+        min_interval: timedelta = timedelta(minutes=DEFAULT_MIN_INTERVAL),
+        max_interval: timedelta = timedelta(minutes=DEFAULT_MAX_INTERVAL),
     ) -> None:
         super().__init__(
             hass,
             logger=_LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(minutes=20),
-            config_entry=entry,
+            name=f"{DOMAIN} {host}",
+            update_interval=min_interval,
+            config_entry=None,
+            always_update=False,
         )
         self.api = api
+        self._min_interval = min_interval.total_seconds()
+        self._max_interval = max_interval.total_seconds()
+        self._seen_latest: Any = None
+        self._synced_latest: Any = None
+        self._synced_day: str | None = None
+        self._last_advance: float | None = None
+        self._cadence: float | None = None
+        self._idle_polls = 0
+        # Time each part of the data was last fetched successfully; parts that
+        # fail keep their previous value so only the month data is required.
+        self._fetched_at: dict[str, datetime] = {}
+        # Granularities needed by enabled entities, with their entity counts.
+        self._required: dict[Granularity, int] = {}
+        self._host = host
+        self._key = key
+        # Sent after every cycle; listeners are not called back by the
+        # coordinator when the data is unchanged.
+        self.metrics_signal = SIGNAL_METRICS_UPDATED.format(key)
+        self.history = UdelectricalHistory(hass, api, key)
+        # Created on first import; see _async_schedule_statistics_import.
+        self.statistics: UdelectricalStatisticsImporter | None = None
+        self.forecaster = UdelectricalForecaster(hass, key)
+        self.cache = UdelectricalPayloadCache(hass, key)
+        self.ranges = UdelectricalRangeCache(api)
+        self.readings = UdelectricalReadings(hass, key)
+        self._import_task: asyncio.Task[None] | None = None
+        self._push_task: asyncio.Task[None] | None = None
 
-    async def _async_update_data(self) -> dict[str, Any] | None:
-        """Fetch data from the udelectrical API."""
-        current_month = datetime.now().strftime("%Y-%m")
-        today = datetime.now().strftime("%Y-%m-%d")
-        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-        try:
-            corrutine_month = self.api._async_request(
-                "GET",
-                f"/api/statistics/by-month/?start_month={current_month}&end_month={current_month}",
+    async def async_setup(self) -> None:
+        """Load the local history, forecast model and last payload.
+
+        The last payload seeds the data, so entities start with their full
+        state, and the sync state, so the first refresh only polls
+        /api/consumption/latest unless it advanced.
+        """
+        await self.history.async_load()
+        await self.forecaster.async_load()
+        await self.readings.async_load()
+        if (payload := await self.cache.async_load()) is None:
+            return
+        self.data = payload.snapshot
+        self._fetched_at = dict(payload.snapshot.fetched_at)
+        self._seen_latest = self._synced_latest = payload.latest
+        self._synced_day = payload.day
+        self.api.restore_validators(
+            _LATEST_URL, payload.etag, payload.last_modified, payload.latest
+        )
+
+    async def async_refresh_if_stale(self) -> None:
+        """Refresh unless the last payload was fetched within the minimum interval.
+
+        After a quick restart the stored payload is still current, so
+        restarting many instances does not cause a burst of requests.
+        """
+        fetched = self._fetched_at.get("latest")
+        if (
+            self.data is not None
+            and fetched is not None
+            and self._synced_day == datetime.now().strftime(DAY_FORMAT)
+            and (dt_util.utcnow() - fetched).total_seconds() < self._min_interval
+        ):
+            _LOGGER.debug("Using the stored udelectrical payload from %s", fetched)
+            return
+        await self.async_refresh()
+
+    @callback
+    def async_restore(self) -> None:
+        """Seed the data from the loaded history if no payload was stored.
+
+        Used by fast start so entities come up with the last synced values
+        while the first refresh runs in the background. Only the period
+        values are restored; analytics and forecasts wait for the refresh.
+        """
+        if self.data is not None:
+            return
+        snapshot = UdelectricalSnapshot.from_history(
+            datetime.now(),
+            (
+                Granularity.DAY,
+                Granularity.WEEK,
+                Granularity.MONTH,
+                Granularity.YEAR_TO_DATE,
+            ),
+            self.history.months,
+            self.history.days,
+            None,
+            {},
+        )
+        if snapshot.periods:
+            self.data = snapshot
+
+    async def async_shutdown(self) -> None:
+        """Cancel background work, stop refreshing and close the API client."""
+        await super().async_shutdown()
+        for task in (self._import_task, self._push_task):
+            if task is not None:
+                task.cancel()
+        self._import_task = None
+        self._push_task = None
+        await self.api.async_close()
+
+    @callback
+    def async_start_push(self) -> None:
+        """Start applying readings pushed by the API, if not already running.
+
+        Polling keeps running on its interval and takes over whenever the
+        stream is down; the stream is reopened with exponential backoff.
+        """
+        if self._push_task is None:
+            self._push_task = self.hass.async_create_background_task(
+                self._async_run_push(), f"{DOMAIN} push updates"
             )
-            corrutine_days = self.api._async_request(
-                "GET",
-                f"/api/statistics/by-day/?start_date={yesterday}&end_date={today}",
+
+    async def _async_run_push(self) -> None:
+        """Consume the push stream, reconnecting with backoff when it drops."""
+        delay = PUSH_RETRY_MIN
+        while True:
+            try:
+                async for reading in self.api.async_stream_latest():
+                    delay = PUSH_RETRY_MIN
+                    self._async_handle_push(reading)
+            except (CannotConnect, InvalidAuth) as err:
+                _LOGGER.debug(
+                    "Push stream unavailable, retrying in %s seconds: %s", delay, err
+                )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, PUSH_RETRY_MAX)
+
+    @callback
+    def _async_handle_push(self, reading: Any) -> None:
+        """Apply a pushed reading and refresh statistics when it is new."""
+        if not reading or self.data is None or reading == self.data.last_updated:
+            return
+        self.async_set_updated_data(replace(self.data, last_updated=reading))
+        self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def async_require(self, granularity: Granularity) -> CALLBACK_TYPE:
+        """Fetch the data for granularity until the returned callback is called.
+
+        Entities register when they are added, so disabled entities cause no
+        requests. A granularity that was not needed before triggers a refresh,
+        unless the data, e.g. a stored payload, already covers it.
+        """
+        count = self._required.get(granularity, 0)
+        self._required[granularity] = count + 1
+        if count == 0 and self.data is not None and not self.data.covers(granularity):
+            self._synced_latest = None
+            # Not tracked as a setup task, so a fast start never waits on it.
+            self.hass.async_create_background_task(
+                self.async_request_refresh(), f"{DOMAIN} refresh"
             )
-            corrutine_updated = self.api._async_request(
-                "GET",
-                f"/api/consumption/latest",
+
+        @callback
+        def _async_release() -> None:
+            if self._required[granularity] == 1:
+                del self._required[granularity]
+            else:
+                self._required[granularity] -= 1
+
+        return _async_release
+
+    def _fetch_plan(self) -> list[str]:
+        """Return the endpoints to sync for the required granularities.
+
+        Until entities register, the month sensors' needs are assumed.
+        """
+        plan: list[str] = []
+        for granularity in self._required or (Granularity.MONTH,):
+            plan.extend(
+                endpoint for endpoint in granularity.endpoints if endpoint not in plan
             )
-            res_month, res_days, res_latest = await asyncio.gather(
-                corrutine_month, corrutine_days, corrutine_updated
+        return plan
+
+    def _async_schedule_statistics_import(self, today: date) -> None:
+        """Import closed days into long-term statistics in the background."""
+        if self.statistics is None:
+            # Imported here; it pulls in the recorder statistics modules,
+            # which are not needed to set up the entry.
+            from .statistics import UdelectricalStatisticsImporter  # noqa: PLC0415
+
+            self.statistics = UdelectricalStatisticsImporter(
+                self.hass, self.api, self._key, self._host
             )
-            output = {}
-            if (
-                isinstance(res_month, list)
-                and res_month
-                and isinstance(res_month[0], dict)
-            ):
-                output = {
-                    **res_month[0],
-                    "today": None,
-                    "yesterday": None,
-                    "last_updated": res_latest if res_latest else None,
-                }
-                if (
-                    isinstance(res_days, list)
-                    and len(res_days) >= 2
-                    and isinstance(res_days[0], dict)
-                    and isinstance(res_days[1], dict)
-                ):
-                    output["today"] = res_days[1]
-                    output["yesterday"] = res_days[0]
-                return output
+        last_closed = today - timedelta(days=2)
+        if not self.statistics.needs_import(last_closed):
+            return
+        if self._import_task is not None and not self._import_task.done():
+            return
+        self._import_task = self.hass.async_create_background_task(
+            self.statistics.async_import(
+                today - timedelta(days=HISTORY_LOOKBACK_DAYS), last_closed
+            ),
+            f"{DOMAIN} statistics import",
+        )
+
+    def _async_adapt_interval(self, advanced: bool) -> None:
+        """Schedule the next poll from the observed ingestion cadence.
+
+        The cadence is an exponential moving average of the time between
+        advances of /api/consumption/latest. The next poll is aimed just after
+        the expected next advance; when it is overdue, polling backs off
+        exponentially from the minimum interval. The result is clamped to the
+        configured bounds.
+        """
+        now = time.monotonic()
+        if advanced:
+            if self._last_advance is not None:
+                observed = now - self._last_advance
+                self._cadence = (
+                    observed
+                    if self._cadence is None
+                    else (1 - _CADENCE_WEIGHT) * self._cadence
+                    + _CADENCE_WEIGHT * observed
+                )
+            self._last_advance = now
+            self._idle_polls = 0
+        elif self._min_interval * 2**self._idle_polls < self._max_interval:
+            # Stop growing once the maximum is reached, so the backoff cannot
+            # overflow while the meter stays silent.
+            self._idle_polls += 1
+
+        interval = self._min_interval * 2**self._idle_polls
+        if self._cadence is not None and self._last_advance is not None:
+            remaining = self._cadence - (now - self._last_advance) + _CADENCE_MARGIN
+            if remaining > 0:
+                interval = remaining
+        self.update_interval = timedelta(
+            seconds=min(max(interval, self._min_interval), self._max_interval)
+        )
+
+    async def _async_update_data(self) -> UdelectricalSnapshot | None:
+        """Fetch data from the udelectrical API and record the cycle duration.
 
+        Successful payloads are persisted for the next start. The metrics
+        signal is sent after every cycle, whatever its outcome.
+        """
+        started = time.perf_counter()
+        stages: dict[str, float] = {}
+        try:
+            snapshot = await self._async_fetch_data(stages)
+        finally:
+            self.api.metrics.record_cycle(time.perf_counter() - started, stages)
+            async_dispatcher_send(self.hass, self.metrics_signal)
+        if snapshot is not None:
+            self.cache.async_schedule_save(self._cached_payload)
+        return snapshot
+
+    def _cached_payload(self) -> CachedPayload | None:
+        """Return the current payload to persist."""
+        if self.data is None:
             return None
+        etag = last_modified = None
+        if (validators := self.api.validators(_LATEST_URL)) is not None and (
+            validators[2] == self._synced_latest
+        ):
+            etag, last_modified, _ = validators
+        return CachedPayload(
+            snapshot=self.data,
+            latest=self._synced_latest,
+            day=self._synced_day,
+            etag=etag,
+            last_modified=last_modified,
+        )
+
+    async def _async_fetch_data(
+        self, stages: dict[str, float]
+    ) -> UdelectricalSnapshot | None:
+        """Fetch data, recording the duration of each stage in stages.
+
+        The cheap /api/consumption/latest endpoint is polled first; month and
+        day statistics are only synced when it advanced or the day changed.
+        """
+        now = datetime.now()
+        today = now.strftime(DAY_FORMAT)
+
+        stage_started = time.perf_counter()
+        try:
+            res_latest = await self.api._async_request("GET", _LATEST_URL)
         except CannotConnect as err:
-            raise UpdateFailed(f"API communication error: {err}") from err
+            _LOGGER.debug("Keeping the last reading, fetching it failed: %s", err)
+            latest_ok = False
+            res_latest = self._seen_latest
+        else:
+            latest_ok = True
+            self._fetched_at["latest"] = dt_util.utcnow()
+            self._async_adapt_interval(res_latest != self._seen_latest)
+            self._seen_latest = res_latest
+        stages["latest"] = time.perf_counter() - stage_started
+        if (
+            latest_ok
+            and res_latest == self._synced_latest
+            and today == self._synced_day
+            and self.data is not None
+        ):
+            return replace(self.data, fetched_at=dict(self._fetched_at))
+
+        plan = self._fetch_plan()
+        syncs = {
+            ENDPOINT_MONTHS: self.history.async_sync_months,
+            ENDPOINT_DAYS: self.history.async_sync_days,
+        }
+        stage_started = time.perf_counter()
+        results = dict(
+            zip(
+                plan,
+                await asyncio.gather(
+                    *(syncs[endpoint](now.date()) for endpoint in plan),
+                    return_exceptions=True,
+                ),
+                strict=True,
+            )
+        )
+        stages["statistics"] = time.perf_counter() - stage_started
+
+        for res in results.values():
+            if isinstance(res, BaseException) and not isinstance(res, CannotConnect):
+                raise res
+        res_months = results.get(ENDPOINT_MONTHS)
+        if isinstance(res_months, CannotConnect):
+            raise UpdateFailed(f"API communication error: {res_months}") from res_months
+        if ENDPOINT_MONTHS in results:
+            self._fetched_at["month"] = dt_util.utcnow()
+        res_days = results.get(ENDPOINT_DAYS)
+        if isinstance(res_days, CannotConnect):
+            _LOGGER.debug(
+                "Keeping the last daily values, fetching them failed: %s", res_days
+            )
+        else:
+            if ENDPOINT_DAYS in results:
+                self._fetched_at["days"] = dt_util.utcnow()
+            if latest_ok:
+                self._synced_latest = res_latest
+                self._synced_day = today
+
+        self._async_schedule_statistics_import(now.date())
+        forecast = None
+        if Granularity.FORECAST in self._required:
+            self.forecaster.update(self.history.days, now.date())
+            forecast = self.forecaster.project(self.history.days, now.date())
+        live = None
+        if Granularity.LIVE in self._required:
+            # The month-to-date consumption serves as the cumulative reading;
+            # it resets at the start of each month.
+            month = self.history.months.get(now.strftime(MONTH_FORMAT))
+            if isinstance(month, dict) and (
+                value := to_float(month.get("consumption"))
+            ) is not None:
+                self.readings.add(dt_util.utcnow().timestamp(), value)
+            live = self.readings.live_values()
+        snapshot = UdelectricalSnapshot.from_history(
+            now,
+            self._required or (Granularity.MONTH,),
+            self.history.months,
+            self.history.days,
+            res_latest,
+            dict(self._fetched_at),
+            forecast,
+            live,
+        )
+        if (
+            snapshot.periods
+            or snapshot.analytics
+            or snapshot.forecast
+            or snapshot.live
+        ):
+            return snapshot
+        return None
+
+
+@dataclass
+class _SharedCoordinator:
+    """A coordinator and the config entries subscribed to it."""
+
+    coordinator: UdelectricalCoordinator
+    entry_ids: set[str] = field(default_factory=set)
+
+
+def entry_key(entry: ConfigEntry) -> str:
+    """Return the key of the coordinator and local storage for an entry.
+
+    Entries with the same host, SSL setting and API key get the same key.
+    The API key only goes in as part of a digest, since the key also names
+    the .storage files and statistic ids.
+    """
+    digest = hashlib.sha256(
+        f"{entry.data.get(CONF_SSL, True)}:{entry.data[CONF_API_KEY]}".encode()
+    ).hexdigest()
+    return f"{slugify(entry.data[CONF_HOST])}_{digest[:12]}"
+
+
+class UdelectricalRegistry:
+    """Share one API client and coordinator across matching config entries.
+
+    Entries share a coordinator, and its local storage, when host, SSL
+    setting and API key all match; see entry_key. Each coordinator is polled
+    once per interval and the result is fanned out to every subscribed
+    entry. The coordinator is shut down when the last entry using it is
+    released.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the registry."""
+        self._hass = hass
+        self._shared: dict[str, _SharedCoordinator] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        # Key each entry was acquired under; its data may change before the
+        # release, e.g. on reauth.
+        self._entry_keys: dict[str, str] = {}
+
+    async def async_acquire(
+        self, entry: ConfigEntry, api: UdelectricalApi, refresh: bool = True
+    ) -> UdelectricalCoordinator:
+        """Return the coordinator for the entry, creating it if needed.
+
+        The api and interval options are only used when no coordinator exists
+        for the entry's key yet; a new coordinator is only published once it
+        is set up. It starts from its stored payload and only refreshes when
+        that is stale; without refresh, it is seeded from the stored history
+        if needed and not refreshed at all.
+        """
+        key = entry_key(entry)
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            if (shared := self._shared.get(key)) is None:
+                coordinator = UdelectricalCoordinator(
+                    self._hass,
+                    api,
+                    entry.data[CONF_HOST],
+                    key,
+                    min_interval=timedelta(
+                        minutes=entry.options.get(
+                            CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL
+                        )
+                    ),
+                    max_interval=timedelta(
+                        minutes=entry.options.get(
+                            CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL
+                        )
+                    ),
+                )
+                await coordinator.async_setup()
+                if refresh:
+                    await coordinator.async_refresh_if_stale()
+                else:
+                    coordinator.async_restore()
+                shared = self._shared[key] = _SharedCoordinator(coordinator)
+            elif shared.coordinator.api is not api:
+                await api.async_close()
+            shared.entry_ids.add(entry.entry_id)
+            self._entry_keys[entry.entry_id] = key
+        if entry.options.get(CONF_PUSH_UPDATES, False):
+            shared.coordinator.async_start_push()
+        return shared.coordinator
+
+    async def async_release(self, entry: ConfigEntry) -> None:
+        """Unsubscribe an entry and shut down the coordinator if unused."""
+        if (key := self._entry_keys.pop(entry.entry_id, None)) is None:
+            return
+        async with self._locks[key]:
+            if (shared := self._shared.get(key)) is None:
+                return
+            shared.entry_ids.discard(entry.entry_id)
+            if not shared.entry_ids:
+                del self._shared[key]
+                await shared.coordinator.async_shutdown()
+
+
+@callback
+def async_get_registry(hass: HomeAssistant) -> UdelectricalRegistry:
+    """Return the coordinator registry, creating it on first use."""
+    if (registry := hass.data.get(DOMAIN)) is None:
+        registry = hass.data[DOMAIN] = UdelectricalRegistry(hass)
+    return registry
+
+
+async def async_remove_stored_data(hass: HomeAssistant, key: str) -> None:
+    """Delete everything stored locally under a key; see entry_key."""
+    for kind in _STORAGE_KINDS:
+        await Store[dict[str, Any]](hass, 1, f"{DOMAIN}.{kind}.{key}").async_remove()
@@ -0,0 +1,157 @@
+"""Month-end forecasting for the udelectrical integration."""
+
+from __future__ import annotations
+
+from calendar import monthrange
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import date, timedelta
+import math
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .models import to_float
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+# Weight of each new day in the exponentially weighted daily statistics; a
+# day's influence halves after roughly a week.
+ALPHA = 0.1
+# Two-sided z-score for the confidence bands (95 %).
+Z_SCORE = 1.96
+
+_SERIES = ("consumption", "cost", "saved")
+
+
+@dataclass(frozen=True, slots=True)
+class MonthForecast:
+    """Projected month-end totals with confidence bands."""
+
+    consumption: float
+    consumption_low: float
+    consumption_high: float
+    cost: float
+    cost_low: float
+    cost_high: float
+    saved: float
+    saved_low: float
+    saved_high: float
+
+
+def _daily_values(record: dict[str, Any]) -> dict[str, float] | None:
+    """Return the consumption, cost and savings of a day record."""
+    consumption = to_float(record.get("consumption"))
+    unit_price = to_float(record.get("unit_price"))
+    actual_price = to_float(record.get("actual_price"))
+    if consumption is None or unit_price is None or actual_price is None:
+        return None
+    return {
+        "consumption": consumption,
+        "cost": actual_price * consumption,
+        "saved": unit_price * consumption - actual_price * consumption,
+    }
+
+
+class UdelectricalForecaster:
+    """Project month-end consumption, cost and savings from daily history.
+
+    The model keeps an exponentially weighted mean and variance per series
+    and folds in each closed day exactly once, so updating it costs O(new
+    days) and never revisits older history. The state is persisted so
+    restarts continue from the last folded day.
+    """
+
+    def __init__(self, hass: HomeAssistant, key: str) -> None:
+        """Initialize the forecaster."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.forecast.{key}"
+        )
+        self._last_day: date | None = None
+        self._mean: dict[str, float] = {}
+        self._var: dict[str, float] = {}
+
+    async def async_load(self) -> None:
+        """Load the model state from disk."""
+        if (data := await self._store.async_load()) is None:
+            return
+        self._last_day = date.fromisoformat(data["last_day"])
+        self._mean = data["mean"]
+        self._var = data["var"]
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the model state to persist."""
+        return {
+            "last_day": self._last_day.isoformat() if self._last_day else None,
+            "mean": self._mean,
+            "var": self._var,
+        }
+
+    def update(self, days: Mapping[str, dict[str, Any]], today: date) -> None:
+        """Fold the closed days after the last folded day into the model.
+
+        Like the history store, days before yesterday count as closed, and
+        only days received without a gap are folded.
+        """
+        last_closed = today - timedelta(days=2)
+        if not days or (self._last_day is not None and self._last_day >= last_closed):
+            return
+        day = (
+            self._last_day + timedelta(days=1)
+            if self._last_day is not None
+            else min((date.fromisoformat(key) for key in days), default=last_closed)
+        )
+        # Stop at the first day that is missing or incomplete, so a day the
+        # API returns late is still folded in.
+        while day <= last_closed:
+            record = days.get(day.isoformat())
+            if not isinstance(record, dict) or not (values := _daily_values(record)):
+                break
+            for series, value in values.items():
+                if series not in self._mean:
+                    self._mean[series] = value
+                    self._var[series] = 0.0
+                    continue
+                diff = value - self._mean[series]
+                increment = ALPHA * diff
+                self._mean[series] += increment
+                self._var[series] = (1 - ALPHA) * (
+                    self._var[series] + diff * increment
+                )
+            self._last_day = day
+            day += timedelta(days=1)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def project(
+        self, days: Mapping[str, dict[str, Any]], today: date
+    ) -> MonthForecast | None:
+        """Project month-end totals from this month's closed days and the model.
+
+        Today and the rest of the month are predicted from the daily mean;
+        the band widens with the square root of the days left.
+        """
+        if not self._mean:
+            return None
+        to_date = dict.fromkeys(_SERIES, 0.0)
+        for day_of_month in range(1, today.day):
+            record = days.get(today.replace(day=day_of_month).isoformat())
+            if isinstance(record, dict) and (values := _daily_values(record)):
+                for series, value in values.items():
+                    to_date[series] += value
+
+        remaining = monthrange(today.year, today.month)[1] - today.day + 1
+        projected: dict[str, float] = {}
+        for series in _SERIES:
+            total = to_date[series] + self._mean[series] * remaining
+            band = Z_SCORE * math.sqrt(self._var[series] * remaining)
+            projected[series] = total
+            low = total - band
+            if series != "saved":
+                # Consumption and cost cannot fall below what is already used.
+                low = max(low, to_date[series])
+            projected[f"{series}_low"] = low
+            projected[f"{series}_high"] = total + band
+        return MonthForecast(**projected)
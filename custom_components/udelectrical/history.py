@@ -0,0 +1,154 @@
+"""Incremental history sync for the udelectrical integration."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .api import UdelectricalApi
+from .const import DOMAIN, HISTORY_LOOKBACK_DAYS
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+DAY_FORMAT = "%Y-%m-%d"
+MONTH_FORMAT = "%Y-%m"
+
+
+def first_of_month(day: date) -> date:
+    """Return the first day of the month containing day."""
+    return day.replace(day=1)
+
+
+def next_month(month: date) -> date:
+    """Return the first day of the month after month."""
+    if month.month == 12:
+        return month.replace(year=month.year + 1, month=1, day=1)
+    return month.replace(month=month.month + 1, day=1)
+
+
+def record_period(record: dict[str, Any], field: str, fallback: str) -> str:
+    """Return the period a record belongs to.
+
+    The API lists one record per period in ascending order; the explicit
+    field is preferred when present so gaps in the response are handled.
+    """
+    value = record.get(field)
+    if isinstance(value, str) and value:
+        return value[: len(fallback)]
+    return fallback
+
+
+class UdelectricalHistory:
+    """Local store of every month and day already fetched from the API.
+
+    Periods that are closed (before yesterday for days, before yesterday's
+    month for months) are treated as immutable and never fetched again; the
+    cursors record the last closed period received without a gap before it.
+    Open periods, and closed ones the API did not return yet, are fetched on
+    every sync.
+    """
+
+    def __init__(self, hass: HomeAssistant, api: UdelectricalApi, key: str) -> None:
+        """Initialize the history store."""
+        self._api = api
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.history.{key}"
+        )
+        self.months: dict[str, dict[str, Any]] = {}
+        self.days: dict[str, dict[str, Any]] = {}
+        self._month_cursor: str | None = None
+        self._day_cursor: str | None = None
+
+    async def async_load(self) -> None:
+        """Load previously synced history from disk."""
+        if (data := await self._store.async_load()) is None:
+            return
+        self.months = data.get("months", {})
+        self.days = data.get("days", {})
+        self._month_cursor = data.get("month_cursor")
+        self._day_cursor = data.get("day_cursor")
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {
+            "months": self.months,
+            "days": self.days,
+            "month_cursor": self._month_cursor,
+            "day_cursor": self._day_cursor,
+        }
+
+    async def async_sync_days(self, today: date) -> None:
+        """Fetch the days after the cursor up to and including today."""
+        last_closed = today - timedelta(days=2)
+        if self._day_cursor is not None:
+            start = date.fromisoformat(self._day_cursor) + timedelta(days=1)
+        else:
+            start = today - timedelta(days=HISTORY_LOOKBACK_DAYS)
+        start = min(start, today - timedelta(days=1))
+
+        res = await self._api._async_request(
+            "GET",
+            f"/api/statistics/by-day/?start_date={start.strftime(DAY_FORMAT)}"
+            f"&end_date={today.strftime(DAY_FORMAT)}",
+        )
+        if not isinstance(res, list):
+            return
+
+        received: set[str] = set()
+        day = start
+        for record in res:
+            if isinstance(record, dict):
+                period = record_period(record, "date", day.strftime(DAY_FORMAT))
+                self.days[period] = record
+                received.add(period)
+            day += timedelta(days=1)
+
+        # Only closed days received without a gap move the cursor, so a day
+        # the API has not ingested yet is fetched again next time.
+        day = start
+        while day <= last_closed and day.strftime(DAY_FORMAT) in received:
+            self._day_cursor = day.strftime(DAY_FORMAT)
+            day += timedelta(days=1)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    async def async_sync_months(self, today: date) -> None:
+        """Fetch the months after the cursor up to and including this month."""
+        current = first_of_month(today)
+        last_open = first_of_month(today - timedelta(days=1))
+        if self._month_cursor is not None:
+            start = next_month(
+                date.fromisoformat(f"{self._month_cursor}-01")
+            )
+        else:
+            start = first_of_month(today - timedelta(days=HISTORY_LOOKBACK_DAYS))
+        start = min(start, last_open)
+
+        res = await self._api._async_request(
+            "GET",
+            f"/api/statistics/by-month/?start_month={start.strftime(MONTH_FORMAT)}"
+            f"&end_month={current.strftime(MONTH_FORMAT)}",
+        )
+        if not isinstance(res, list):
+            return
+
+        received: set[str] = set()
+        month = start
+        for record in res:
+            if isinstance(record, dict):
+                period = record_period(record, "month", month.strftime(MONTH_FORMAT))
+                self.months[period] = record
+                received.add(period)
+            month = next_month(month)
+
+        month = start
+        while month < last_open and month.strftime(MONTH_FORMAT) in received:
+            self._month_cursor = month.strftime(MONTH_FORMAT)
+            month = next_month(month)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
@@ -0,0 +1,131 @@
+"""Request and update cycle metrics for the udelectrical integration."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any
+
+# Upper bounds of the request latency histogram buckets, in seconds. The last
+# bucket counts everything slower than the final bound.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass(slots=True)
+class EndpointMetrics:
+    """Counters and timings for a single API endpoint."""
+
+    successes: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    not_modified: int = 0
+    latency_total: float = 0.0
+    last_latency: float | None = None
+    latency_histogram: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+    response_bytes: int = 0
+    last_response_bytes: int | None = None
+    parse_time_total: float = 0.0
+
+    @property
+    def requests(self) -> int:
+        """Return the number of completed requests."""
+        return self.successes + self.failures + self.timeouts
+
+    def record_latency(self, latency: float) -> None:
+        """Record the latency of a request that got a response."""
+        self.latency_total += latency
+        self.last_latency = latency
+        self.latency_histogram[bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def record_response(self, size: int, parse_time: float) -> None:
+        """Record the size and parse time of a response body."""
+        self.response_bytes += size
+        self.last_response_bytes = size
+        self.parse_time_total += parse_time
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as a dictionary."""
+        answered = sum(self.latency_histogram)
+        parsed = self.successes - self.not_modified
+        return {
+            "successes": self.successes,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "not_modified": self.not_modified,
+            "average_latency": self.latency_total / answered if answered else None,
+            "last_latency": self.last_latency,
+            "latency_histogram": dict(
+                zip(
+                    [*(f"le_{bound}" for bound in LATENCY_BUCKETS), "inf"],
+                    self.latency_histogram,
+                    strict=True,
+                )
+            ),
+            "response_bytes": self.response_bytes,
+            "last_response_bytes": self.last_response_bytes,
+            "average_parse_time": self.parse_time_total / parsed if parsed else None,
+        }
+
+
+@dataclass(slots=True)
+class UdelectricalMetrics:
+    """Metrics for all requests made by one API client and its coordinator."""
+
+    endpoints: dict[str, EndpointMetrics] = field(default_factory=dict)
+    cycles: int = 0
+    cycle_time_total: float = 0.0
+    last_cycle_duration: float | None = None
+    last_stage_durations: dict[str, float] = field(default_factory=dict)
+
+    def endpoint(self, url: str) -> EndpointMetrics:
+        """Return the metrics for the endpoint of a request URL."""
+        path = url.partition("?")[0]
+        if (metrics := self.endpoints.get(path)) is None:
+            metrics = self.endpoints[path] = EndpointMetrics()
+        return metrics
+
+    def record_cycle(self, duration: float, stages: dict[str, float]) -> None:
+        """Record the duration of a coordinator update cycle."""
+        self.cycles += 1
+        self.cycle_time_total += duration
+        self.last_cycle_duration = duration
+        self.last_stage_durations = stages
+
+    @property
+    def failures(self) -> int:
+        """Return the number of failed requests over all endpoints."""
+        return sum(metrics.failures for metrics in self.endpoints.values())
+
+    @property
+    def timeouts(self) -> int:
+        """Return the number of timed out requests over all endpoints."""
+        return sum(metrics.timeouts for metrics in self.endpoints.values())
+
+    @property
+    def average_latency(self) -> float | None:
+        """Return the average latency over all endpoints, in seconds."""
+        answered = sum(
+            sum(metrics.latency_histogram) for metrics in self.endpoints.values()
+        )
+        if not answered:
+            return None
+        return (
+            sum(metrics.latency_total for metrics in self.endpoints.values())
+            / answered
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as a dictionary."""
+        return {
+            "cycles": self.cycles,
+            "average_cycle_duration": (
+                self.cycle_time_total / self.cycles if self.cycles else None
+            ),
+            "last_cycle_duration": self.last_cycle_duration,
+            "last_stage_durations": self.last_stage_durations,
+            "endpoints": {
+                path: metrics.as_dict() for path, metrics in self.endpoints.items()
+            },
+        }
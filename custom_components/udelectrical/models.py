@@ -0,0 +1,261 @@
+"""Data models for the udelectrical integration."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from .analytics import UdelectricalAnalytics
+    from .forecast import MonthForecast
+    from .readings import LiveValues
+
+# Keys of the month record that also get today/yesterday attributes.
+DAILY_KEYS = ("unit_price", "actual_price", "consumption")
+
+ENDPOINT_DAYS = "days"
+ENDPOINT_MONTHS = "months"
+
+
+def to_float(value: Any) -> float | None:
+    """Convert a value to float, returning None if conversion fails."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+class StatisticsRow(NamedTuple):
+    """Compact form of one day or month record.
+
+    period is the record's date or month field as sent, or None when the
+    record has none.
+    """
+
+    period: str | None
+    unit_price: float | None
+    actual_price: float | None
+    consumption: float | None
+
+    @classmethod
+    def from_record(cls, record: dict[str, Any], field: str) -> StatisticsRow:
+        """Convert a parsed record, reading its period from field."""
+        period = record.get(field)
+        return cls(
+            period if isinstance(period, str) and period else None,
+            to_float(record.get("unit_price")),
+            to_float(record.get("actual_price")),
+            to_float(record.get("consumption")),
+        )
+
+
+class Granularity(StrEnum):
+    """Period a sensor reports on."""
+
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+    YEAR_TO_DATE = "year_to_date"
+    ROLLING = "rolling"
+    FORECAST = "forecast"
+    LIVE = "live"
+
+    @property
+    def endpoints(self) -> tuple[str, ...]:
+        """Return the statistics endpoints needed to report this period.
+
+        The history store decides which dates to request from each endpoint;
+        it always covers the periods every granularity reads. Month sensors
+        also need the day endpoint for their daily attributes.
+        """
+        if self is Granularity.MONTH:
+            return (ENDPOINT_MONTHS, ENDPOINT_DAYS)
+        if self in (Granularity.YEAR_TO_DATE, Granularity.LIVE):
+            return (ENDPOINT_MONTHS,)
+        return (ENDPOINT_DAYS,)
+
+
+@dataclass(frozen=True, slots=True)
+class PeriodValues:
+    """Converted values for one reporting period."""
+
+    label: str
+    unit_price: float | None
+    actual_price: float | None
+    consumption: float | None
+    saved: float | None
+
+    @classmethod
+    def from_records(
+        cls, label: str, records: Iterable[dict[str, Any]]
+    ) -> PeriodValues | None:
+        """Aggregate records into period values.
+
+        Consumption is summed and prices are averaged weighted by consumption;
+        a single record is taken as is.
+        """
+        records = list(records)
+        if not records:
+            return None
+        if len(records) == 1:
+            unit_price = to_float(records[0].get("unit_price"))
+            actual_price = to_float(records[0].get("actual_price"))
+            consumption = to_float(records[0].get("consumption"))
+        else:
+            consumption = 0.0
+            unit_total = actual_total = 0.0
+            for record in records:
+                if (value := to_float(record.get("consumption"))) is None:
+                    continue
+                consumption += value
+                unit_total += (to_float(record.get("unit_price")) or 0.0) * value
+                actual_total += (to_float(record.get("actual_price")) or 0.0) * value
+            unit_price = unit_total / consumption if consumption else None
+            actual_price = actual_total / consumption if consumption else None
+
+        saved = None
+        if (
+            unit_price is not None
+            and actual_price is not None
+            and consumption is not None
+        ):
+            saved = unit_price * consumption - actual_price * consumption
+        return cls(label, unit_price, actual_price, consumption, saved)
+
+
+@dataclass(frozen=True, slots=True)
+class UdelectricalSnapshot:
+    """Sensor values derived once per coordinator update.
+
+    Values are converted to floats up front so entities only read their own
+    field; daily_attributes holds the today/yesterday attributes per key for
+    the month sensors. analytics, forecast and live are only set when
+    required. fetched_at is left out of equality, so a poll that only
+    refreshed the fetch times does not notify listeners.
+    """
+
+    periods: Mapping[Granularity, PeriodValues]
+    analytics: UdelectricalAnalytics | None
+    forecast: MonthForecast | None
+    live: LiveValues | None
+    daily_attributes: Mapping[str, Mapping[str, float]]
+    last_updated: Any
+    fetched_at: Mapping[str, datetime] = field(compare=False)
+
+    @classmethod
+    def from_history(
+        cls,
+        now: datetime,
+        granularities: Iterable[Granularity],
+        months: Mapping[str, dict[str, Any]],
+        days: Mapping[str, dict[str, Any]],
+        last_updated: Any,
+        fetched_at: Mapping[str, datetime],
+        forecast: MonthForecast | None = None,
+        live: LiveValues | None = None,
+    ) -> UdelectricalSnapshot:
+        """Build a snapshot for the given granularities from synced records."""
+        today = now.date()
+        periods: dict[Granularity, PeriodValues] = {}
+        analytics = None
+        for granularity in granularities:
+            if granularity is Granularity.ROLLING:
+                # Imported here; the analytics module depends on this one.
+                from .analytics import compute_analytics  # noqa: PLC0415
+
+                analytics = compute_analytics(days, today)
+                continue
+            if granularity in (Granularity.FORECAST, Granularity.LIVE):
+                continue
+            if granularity is Granularity.DAY:
+                label = today.isoformat()
+                keys = [today.isoformat()]
+                source = days
+            elif granularity is Granularity.WEEK:
+                label = f"{(today - timedelta(days=6)).isoformat()} - {today}"
+                keys = [(today - timedelta(days=n)).isoformat() for n in range(7)]
+                source = days
+            elif granularity is Granularity.MONTH:
+                label = now.strftime("%B, %Y")
+                keys = [now.strftime("%Y-%m")]
+                source = months
+            else:
+                label = now.strftime("%Y")
+                keys = [
+                    f"{today.year}-{month:02d}" for month in range(1, today.month + 1)
+                ]
+                source = months
+            values = PeriodValues.from_records(
+                label,
+                (source[key] for key in keys if isinstance(source.get(key), dict)),
+            )
+            if values is not None:
+                periods[granularity] = values
+
+        daily_attributes: dict[str, dict[str, float]] = {}
+        day = days.get(today.isoformat())
+        previous = days.get((today - timedelta(days=1)).isoformat())
+        if isinstance(day, dict) and isinstance(previous, dict):
+            for key in DAILY_KEYS:
+                attributes = daily_attributes[key] = {}
+                if (value := to_float(previous.get(key))) is not None:
+                    attributes["yesterday"] = value
+                if (value := to_float(day.get(key))) is not None:
+                    attributes["today"] = value
+
+        return cls(
+            periods=periods,
+            analytics=analytics,
+            forecast=forecast,
+            live=live,
+            daily_attributes=daily_attributes,
+            last_updated=last_updated if last_updated else None,
+            fetched_at=fetched_at,
+        )
+
+    def covers(self, granularity: Granularity) -> bool:
+        """Return True if the snapshot has values for granularity."""
+        if granularity is Granularity.ROLLING:
+            return self.analytics is not None
+        if granularity is Granularity.FORECAST:
+            return self.forecast is not None
+        if granularity is Granularity.LIVE:
+            return self.live is not None
+        return granularity in self.periods
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> UdelectricalSnapshot:
+        """Rebuild a snapshot from its dataclasses.asdict form."""
+        analytics = forecast = live = None
+        if data.get("analytics"):
+            from .analytics import UdelectricalAnalytics  # noqa: PLC0415
+
+            analytics = UdelectricalAnalytics(**data["analytics"])
+        if data.get("forecast"):
+            from .forecast import MonthForecast  # noqa: PLC0415
+
+            forecast = MonthForecast(**data["forecast"])
+        if data.get("live"):
+            from .readings import LiveValues  # noqa: PLC0415
+
+            live = LiveValues(**data["live"])
+        return cls(
+            periods={
+                Granularity(key): PeriodValues(**values)
+                for key, values in data["periods"].items()
+            },
+            analytics=analytics,
+            forecast=forecast,
+            live=live,
+            daily_attributes=data["daily_attributes"],
+            last_updated=data["last_updated"],
+            fetched_at={
+                key: datetime.fromisoformat(value)
+                for key, value in data["fetched_at"].items()
+            },
+        )
@@ -0,0 +1,232 @@
+"""Cache of fetched statistics ranges for the udelectrical integration."""
+
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any
+
+from homeassistant.helpers.json import json_bytes
+
+from .api import UdelectricalApi
+from .history import (
+    DAY_FORMAT,
+    MONTH_FORMAT,
+    first_of_month,
+    next_month,
+    record_period,
+)
+from .models import Granularity
+
+# Upper bound for the estimated size of all cached records, in bytes.
+MAX_CACHE_BYTES = 2 * 1024 * 1024
+
+
+@dataclass(slots=True, eq=False)
+class _Segment:
+    """Records of one fetched range of closed periods, bounds inclusive."""
+
+    granularity: Granularity
+    start: date
+    end: date
+    records: dict[str, dict[str, Any]]
+    size: int
+
+
+def _step(granularity: Granularity, period: date) -> date:
+    """Return the period after period."""
+    if granularity is Granularity.MONTH:
+        return next_month(period)
+    return period + timedelta(days=1)
+
+
+def _previous(granularity: Granularity, period: date) -> date:
+    """Return the period before period."""
+    if granularity is Granularity.MONTH:
+        return first_of_month(period - timedelta(days=1))
+    return period - timedelta(days=1)
+
+
+def _last_closed(granularity: Granularity, today: date) -> date:
+    """Return the last closed period, as defined by the history store."""
+    if granularity is Granularity.MONTH:
+        return _previous(granularity, first_of_month(today - timedelta(days=1)))
+    return today - timedelta(days=2)
+
+
+def _key(granularity: Granularity, period: date) -> str:
+    """Return the record key of a period."""
+    return period.strftime(
+        MONTH_FORMAT if granularity is Granularity.MONTH else DAY_FORMAT
+    )
+
+
+def _received_until(
+    granularity: Granularity,
+    start: date,
+    end: date,
+    records: dict[str, dict[str, Any]],
+) -> date | None:
+    """Return the last period from start to end received without a gap."""
+    last = None
+    period = start
+    while period <= end and _key(granularity, period) in records:
+        last = period
+        period = _step(granularity, period)
+    return last
+
+
+class UdelectricalRangeCache:
+    """Answer day and month range queries from previously fetched ranges.
+
+    Each fetched range of closed periods is kept as a segment. Segments of a
+    granularity are disjoint and kept sorted, so the segments overlapping a
+    query are found by bisection and only the gaps between them are fetched.
+    Closed periods never change and are kept until evicted, least recently
+    used first, once the estimated size exceeds MAX_CACHE_BYTES. Open periods,
+    and closed ones the API did not return yet, are always fetched.
+    """
+
+    def __init__(
+        self, api: UdelectricalApi, max_bytes: int = MAX_CACHE_BYTES
+    ) -> None:
+        """Initialize the range cache."""
+        self._api = api
+        self._max_bytes = max_bytes
+        self._segments: dict[Granularity, list[_Segment]] = {
+            Granularity.DAY: [],
+            Granularity.MONTH: [],
+        }
+        self._lru: OrderedDict[tuple[Granularity, date], _Segment] = OrderedDict()
+        self._size = 0
+        self._lock = asyncio.Lock()
+
+    async def async_get(
+        self, granularity: Granularity, start: date, end: date, today: date
+    ) -> dict[str, dict[str, Any]]:
+        """Return the records from start to end inclusive, keyed by period.
+
+        granularity is DAY or MONTH; for months, start and end may be any day
+        of their month.
+        """
+        if granularity is Granularity.MONTH:
+            start, end = first_of_month(start), first_of_month(end)
+        closed_end = min(end, _last_closed(granularity, today))
+        first, last = _key(granularity, start), _key(granularity, end)
+        async with self._lock:
+            records: dict[str, dict[str, Any]] = {}
+            # (start, end, cacheable) of every range that must be fetched.
+            missing: list[tuple[date, date, bool]] = []
+            cursor = start
+            for segment in self._overlapping(granularity, start, closed_end):
+                if segment.start > cursor:
+                    missing.append(
+                        (cursor, _previous(granularity, segment.start), True)
+                    )
+                records.update(
+                    (key, record)
+                    for key, record in segment.records.items()
+                    if first <= key <= last
+                )
+                self._lru.move_to_end((granularity, segment.start))
+                cursor = _step(granularity, segment.end)
+            if cursor <= closed_end:
+                missing.append((cursor, closed_end, True))
+            if end > closed_end:
+                missing.append((max(start, _step(granularity, closed_end)), end, False))
+
+            fetched = await asyncio.gather(
+                *(
+                    self._async_fetch(granularity, range_start, range_end)
+                    for range_start, range_end, _ in missing
+                )
+            )
+            for (range_start, range_end, cacheable), range_records in zip(
+                missing, fetched, strict=True
+            ):
+                records.update(range_records)
+                # Only the periods received without a gap are cached; the
+                # rest may not be ingested yet and is fetched again.
+                if cacheable and (
+                    received := _received_until(
+                        granularity, range_start, range_end, range_records
+                    )
+                ) is not None:
+                    first_key = _key(granularity, range_start)
+                    last_key = _key(granularity, received)
+                    self._insert(
+                        granularity,
+                        range_start,
+                        received,
+                        {
+                            key: record
+                            for key, record in range_records.items()
+                            if first_key <= key <= last_key
+                        },
+                    )
+        return dict(sorted(records.items()))
+
+    def _overlapping(
+        self, granularity: Granularity, start: date, end: date
+    ) -> list[_Segment]:
+        """Return the segments overlapping start to end, in order."""
+        segments = self._segments[granularity]
+        index = bisect_left(segments, start, key=lambda segment: segment.end)
+        overlapping = []
+        while index < len(segments) and segments[index].start <= end:
+            overlapping.append(segments[index])
+            index += 1
+        return overlapping
+
+    def _insert(
+        self,
+        granularity: Granularity,
+        start: date,
+        end: date,
+        records: dict[str, dict[str, Any]],
+    ) -> None:
+        """Cache the records of a closed range and evict down to the budget."""
+        segment = _Segment(granularity, start, end, records, len(json_bytes(records)))
+        if segment.size > self._max_bytes:
+            return
+        insort(
+            self._segments[granularity], segment, key=lambda segment: segment.start
+        )
+        self._lru[(granularity, start)] = segment
+        self._size += segment.size
+        while self._size > self._max_bytes:
+            _, evicted = self._lru.popitem(last=False)
+            self._segments[evicted.granularity].remove(evicted)
+            self._size -= evicted.size
+
+    async def _async_fetch(
+        self, granularity: Granularity, start: date, end: date
+    ) -> dict[str, dict[str, Any]]:
+        """Fetch the records from start to end inclusive."""
+        if granularity is Granularity.MONTH:
+            url = (
+                f"/api/statistics/by-month/?start_month={start.strftime(MONTH_FORMAT)}"
+                f"&end_month={end.strftime(MONTH_FORMAT)}"
+            )
+            field = "month"
+        else:
+            url = (
+                f"/api/statistics/by-day/?start_date={start.strftime(DAY_FORMAT)}"
+                f"&end_date={end.strftime(DAY_FORMAT)}"
+            )
+            field = "date"
+        res = await self._api._async_request("GET", url)
+        records: dict[str, dict[str, Any]] = {}
+        if not isinstance(res, list):
+            return records
+        period = start
+        for record in res:
+            if isinstance(record, dict):
+                records[record_period(record, field, _key(granularity, period))] = (
+                    record
+                )
+            period = _step(granularity, period)
+        return records
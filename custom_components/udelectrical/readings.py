@@ -0,0 +1,142 @@
+"""Live readings for the udelectrical integration."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+# Number of readings kept; older readings are overwritten.
+CAPACITY = 96
+
+
+@dataclass(frozen=True, slots=True)
+class LiveValues:
+    """Values derived from the recent readings.
+
+    energy is the latest cumulative reading in kWh. power covers the last
+    interval and average_power every interval since the cumulative value
+    last reset, both in W; power_change is the change in power per hour.
+    """
+
+    energy: float
+    power: float | None
+    average_power: float | None
+    power_change: float | None
+
+
+class ReadingBuffer:
+    """Fixed-size ring buffer of (timestamp, cumulative kWh) readings.
+
+    Readings are stored in two preallocated arrays of doubles, so appending
+    is O(1) and memory stays bounded by the capacity.
+    """
+
+    def __init__(self, capacity: int = CAPACITY) -> None:
+        """Initialize an empty buffer."""
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._capacity = capacity
+        self._start = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of readings held."""
+        return self._count
+
+    def __iter__(self) -> Iterator[tuple[float, float]]:
+        """Iterate over the readings, oldest first."""
+        for offset in range(self._count):
+            index = (self._start + offset) % self._capacity
+            yield self._times[index], self._values[index]
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a reading, overwriting the oldest one when full."""
+        if self._count < self._capacity:
+            index = (self._start + self._count) % self._capacity
+            self._count += 1
+        else:
+            index = self._start
+            self._start = (self._start + 1) % self._capacity
+        self._times[index] = timestamp
+        self._values[index] = value
+
+    def last(self) -> tuple[float, float] | None:
+        """Return the newest reading."""
+        if not self._count:
+            return None
+        index = (self._start + self._count - 1) % self._capacity
+        return self._times[index], self._values[index]
+
+
+def _power(first: tuple[float, float], last: tuple[float, float]) -> float | None:
+    """Return the average power between two readings, in W."""
+    seconds = last[0] - first[0]
+    if seconds <= 0:
+        return None
+    return (last[1] - first[1]) * 1000 * 3600 / seconds
+
+
+class UdelectricalReadings:
+    """Recent cumulative energy readings, persisted across restarts."""
+
+    def __init__(self, hass: HomeAssistant, key: str) -> None:
+        """Initialize the readings."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.readings.{key}"
+        )
+        self._buffer = ReadingBuffer()
+
+    async def async_load(self) -> None:
+        """Load the stored readings."""
+        if (data := await self._store.async_load()) is None:
+            return
+        for timestamp, value in data["readings"]:
+            self._buffer.append(timestamp, value)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the readings to persist."""
+        return {"readings": [list(reading) for reading in self._buffer]}
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Record a cumulative reading if it changed since the last one.
+
+        A value below the last one is taken as a reset of the counter.
+        """
+        if (last := self._buffer.last()) is not None and (
+            value == last[1] or timestamp <= last[0]
+        ):
+            return
+        self._buffer.append(timestamp, value)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def live_values(self) -> LiveValues | None:
+        """Derive the live values from the readings since the last reset."""
+        readings = list(self._buffer)
+        if not readings:
+            return None
+        first = len(readings) - 1
+        while first > 0 and readings[first - 1][1] <= readings[first][1]:
+            first -= 1
+        readings = readings[first:]
+
+        power = average_power = power_change = None
+        if len(readings) >= 2:
+            power = _power(readings[-2], readings[-1])
+            average_power = _power(readings[0], readings[-1])
+        if len(readings) >= 3 and power is not None:
+            previous = _power(readings[-3], readings[-2])
+            # Hours between the midpoints of the last two intervals.
+            hours = (readings[-1][0] - readings[-3][0]) / 2 / 3600
+            if previous is not None and hours > 0:
+                power_change = (power - previous) / hours
+        return LiveValues(readings[-1][1], power, average_power, power_change)
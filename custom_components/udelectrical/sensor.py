@@ -2,47 +2,76 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+import time
 from typing import Any
 
 from homeassistant.components.sensor import (
+    SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
+    SensorStateClass,
     RestoreEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfEnergy,
+    UnitOfPower,
+    UnitOfTime,
+)
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import CONF_ATTRIBUTE_INTERVAL, DEFAULT_ATTRIBUTE_INTERVAL, DOMAIN
 from .coordinator import UdelectricalCoordinator
+from .metrics import UdelectricalMetrics
+from .models import Granularity, UdelectricalSnapshot
 
-SENSOR_DESCRIPTIONS = [
-    SensorEntityDescription(
+
+@dataclass(frozen=True, kw_only=True)
+class UDElectricalSensorEntityDescription(SensorEntityDescription):
+    """Describes a UDElectrical sensor and the period it reports on."""
+
+    granularity: Granularity = Granularity.MONTH
+    value_key: str
+
+
+_VALUE_DESCRIPTIONS = [
+    UDElectricalSensorEntityDescription(
         key="unit_price",
+        value_key="unit_price",
         name="Average Units Price",
         icon="mdi:currency-usd",
         native_unit_of_measurement="SEK/kWh",
         suggested_display_precision=3,
     ),
-    SensorEntityDescription(
+    UDElectricalSensorEntityDescription(
         key="actual_price",
+        value_key="actual_price",
         name="Average Actual Price",
         icon="mdi:cash",
         native_unit_of_measurement="SEK/kWh",
         suggested_display_precision=3,
     ),
-    SensorEntityDescription(
+    UDElectricalSensorEntityDescription(
         key="consumption",
+        value_key="consumption",
         name="Consumption",
         icon="mdi:lightning-bolt",
         native_unit_of_measurement="kWh",
         suggested_display_precision=2,
     ),
-    SensorEntityDescription(
+    UDElectricalSensorEntityDescription(
         key="saved",
+        value_key="saved",
         name="Saved",
         icon="mdi:piggy-bank",
         native_unit_of_measurement="SEK",
@@ -50,6 +79,231 @@ SENSOR_DESCRIPTIONS = [
     ),
 ]
 
+_GRANULARITY_NAMES = {
+    Granularity.DAY: "Today",
+    Granularity.WEEK: "Last 7 Days",
+    Granularity.YEAR_TO_DATE: "Year to Date",
+}
+
+# The month sensors keep their original keys; the other granularities and the
+# rolling analytics are disabled by default so they cost nothing until enabled.
+SENSOR_DESCRIPTIONS = [
+    *_VALUE_DESCRIPTIONS,
+    *(
+        replace(
+            description,
+            key=f"{granularity}_{description.value_key}",
+            name=f"{name} {description.name}",
+            granularity=granularity,
+            entity_registry_enabled_default=False,
+        )
+        for granularity, name in _GRANULARITY_NAMES.items()
+        for description in _VALUE_DESCRIPTIONS
+    ),
+    UDElectricalSensorEntityDescription(
+        key="average_consumption_7d",
+        value_key="average_consumption_7d",
+        granularity=Granularity.ROLLING,
+        name="7-Day Average Consumption",
+        icon="mdi:lightning-bolt",
+        native_unit_of_measurement="kWh",
+        suggested_display_precision=2,
+        entity_registry_enabled_default=False,
+    ),
+    UDElectricalSensorEntityDescription(
+        key="average_consumption_30d",
+        value_key="average_consumption_30d",
+        granularity=Granularity.ROLLING,
+        name="30-Day Average Consumption",
+        icon="mdi:lightning-bolt",
+        native_unit_of_measurement="kWh",
+        suggested_display_precision=2,
+        entity_registry_enabled_default=False,
+    ),
+    UDElectricalSensorEntityDescription(
+        key="average_price_7d",
+        value_key="average_price_7d",
+        granularity=Granularity.ROLLING,
+        name="7-Day Average Actual Price",
+        icon="mdi:cash",
+        native_unit_of_measurement="SEK/kWh",
+        suggested_display_precision=3,
+        entity_registry_enabled_default=False,
+    ),
+    UDElectricalSensorEntityDescription(
+        key="average_price_30d",
+        value_key="average_price_30d",
+        granularity=Granularity.ROLLING,
+        name="30-Day Average Actual Price",
+        icon="mdi:cash",
+        native_unit_of_measurement="SEK/kWh",
+        suggested_display_precision=3,
+        entity_registry_enabled_default=False,
+    ),
+    UDElectricalSensorEntityDescription(
+        key="weighted_price_30d",
+        value_key="weighted_price_30d",
+        granularity=Granularity.ROLLING,
+        name="30-Day Load-Weighted Price",
+        icon="mdi:cash",
+        native_unit_of_measurement="SEK/kWh",
+        suggested_display_precision=3,
+        entity_registry_enabled_default=False,
+    ),
+    UDElectricalSensorEntityDescription(
+        key="consumption_p50_30d",
+        value_key="consumption_p50_30d",
+        granularity=Granularity.ROLLING,
+        name="30-Day Median Daily Consumption",
+        icon="mdi:chart-bell-curve",
+        native_unit_of_measurement="kWh",
+        suggested_display_precision=2,
+        entity_registry_enabled_default=False,
+    ),
+    UDElectricalSensorEntityDescription(
+        key="consumption_p90_30d",
+        value_key="consumption_p90_30d",
+        granularity=Granularity.ROLLING,
+        name="30-Day 90th Percentile Daily Consumption",
+        icon="mdi:chart-bell-curve",
+        native_unit_of_measurement="kWh",
+        suggested_display_precision=2,
+        entity_registry_enabled_default=False,
+    ),
+    UDElectricalSensorEntityDescription(
+        key="peak_day_share_30d",
+        value_key="peak_day_share_30d",
+        granularity=Granularity.ROLLING,
+        name="30-Day Peak Day Share",
+        icon="mdi:chart-pie",
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=1,
+        entity_registry_enabled_default=False,
+    ),
+    UDElectricalSensorEntityDescription(
+        key="forecast_consumption",
+        value_key="consumption",
+        granularity=Granularity.FORECAST,
+        name="Month-End Consumption Forecast",
+        icon="mdi:chart-line",
+        native_unit_of_measurement="kWh",
+        suggested_display_precision=2,
+        entity_registry_enabled_default=False,
+    ),
+    UDElectricalSensorEntityDescription(
+        key="forecast_cost",
+        value_key="cost",
+        granularity=Granularity.FORECAST,
+        name="Month-End Cost Forecast",
+        icon="mdi:chart-line",
+        native_unit_of_measurement="SEK",
+        suggested_display_precision=2,
+        entity_registry_enabled_default=False,
+    ),
+    UDElectricalSensorEntityDescription(
+        key="forecast_saved",
+        value_key="saved",
+        granularity=Granularity.FORECAST,
+        name="Month-End Savings Forecast",
+        icon="mdi:chart-line",
+        native_unit_of_measurement="SEK",
+        suggested_display_precision=2,
+        entity_registry_enabled_default=False,
+    ),
+    UDElectricalSensorEntityDescription(
+        key="power",
+        value_key="power",
+        granularity=Granularity.LIVE,
+        name="Power",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfPower.WATT,
+        suggested_display_precision=0,
+        entity_registry_enabled_default=False,
+    ),
+    UDElectricalSensorEntityDescription(
+        key="power_change",
+        value_key="power_change",
+        granularity=Granularity.LIVE,
+        name="Power Rate of Change",
+        icon="mdi:chart-line-variant",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="W/h",
+        suggested_display_precision=0,
+        entity_registry_enabled_default=False,
+    ),
+    UDElectricalSensorEntityDescription(
+        key="energy",
+        value_key="energy",
+        granularity=Granularity.LIVE,
+        name="Energy",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        suggested_display_precision=2,
+        entity_registry_enabled_default=False,
+    ),
+]
+
+
+@dataclass(frozen=True, kw_only=True)
+class UDElectricalDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes a UDElectrical diagnostic sensor."""
+
+    value_fn: Callable[[UdelectricalMetrics], float | int | None]
+
+
+DIAGNOSTIC_SENSOR_DESCRIPTIONS = [
+    UDElectricalDiagnosticSensorEntityDescription(
+        key="update_duration",
+        name="Last update duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=3,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda metrics: metrics.last_cycle_duration,
+    ),
+    UDElectricalDiagnosticSensorEntityDescription(
+        key="request_latency",
+        name="Average request latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda metrics: (
+            None if metrics.average_latency is None else metrics.average_latency * 1000
+        ),
+    ),
+    UDElectricalDiagnosticSensorEntityDescription(
+        key="request_failures",
+        name="Request failures",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda metrics: metrics.failures,
+    ),
+    UDElectricalDiagnosticSensorEntityDescription(
+        key="request_timeouts",
+        name="Request timeouts",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda metrics: metrics.timeouts,
+    ),
+]
+
+
+def _device_info(entry: ConfigEntry) -> DeviceInfo:
+    """Return the device info shared by all sensors of an entry."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, entry.entry_id)},
+        name=entry.title,
+        manufacturer="UDElectrical",
+        model="Energy Monitor",
+    )
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -57,19 +311,15 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up UDElectrical sensors from a config entry."""
-    if DOMAIN not in hass.data:
-        hass.data[DOMAIN] = {}
-    if entry.entry_id not in hass.data[DOMAIN]:
-        api = entry.runtime_data
-        coordinator = UdelectricalCoordinator(hass, api, entry)
-        await coordinator.async_config_entry_first_refresh()
-        hass.data[DOMAIN][entry.entry_id] = coordinator
-    else:
-        coordinator = hass.data[DOMAIN][entry.entry_id]
-    entities = [
+    coordinator: UdelectricalCoordinator = entry.runtime_data
+    entities: list[SensorEntity] = [
         UDElectricalSensor(entry, coordinator, description)
         for description in SENSOR_DESCRIPTIONS
     ]
+    entities.extend(
+        UDElectricalDiagnosticSensor(entry, coordinator, description)
+        for description in DIAGNOSTIC_SENSOR_DESCRIPTIONS
+    )
     async_add_entities(entities)
 
 
@@ -79,34 +329,47 @@ class UDElectricalSensor(
     """Representation of a UDElectrical sensor entity."""
 
     _attr_has_entity_name = True
+    entity_description: UDElectricalSensorEntityDescription
 
     def __init__(
         self,
         entry: ConfigEntry,
         coordinator: UdelectricalCoordinator,
-        description: SensorEntityDescription,
+        description: UDElectricalSensorEntityDescription,
     ) -> None:
         """Initialize the UDElectrical sensor."""
         super().__init__(coordinator)
         self.entity_description = description
         self._attr_unique_id = f"{entry.entry_id}_{description.key}"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, entry.entry_id)},
-            name=entry.title,
-            manufacturer="UDElectrical",
-            model="Energy Monitor",
-        )
-        self._restored_value = None
+        self._attr_device_info = _device_info(entry)
         self._attr_native_value = None
+        self._attr_extra_state_attributes = {}
+        if description.granularity is Granularity.MONTH:
+            self._attr_extra_state_attributes["For"] = datetime.now().strftime(
+                "%B, %Y"  # Full month name
+            )
+        self._attribute_interval = timedelta(
+            minutes=entry.options.get(
+                CONF_ATTRIBUTE_INTERVAL, DEFAULT_ATTRIBUTE_INTERVAL
+            )
+        ).total_seconds()
+        self._written_available = True
+        self._written_at = 0.0
+        self._pending_attributes: dict[str, Any] | None = None
+        self._cancel_deferred_write: CALLBACK_TYPE | None = None
 
     async def async_added_to_hass(self) -> None:
         """Restore state on startup."""
         await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_require(self.entity_description.granularity)
+        )
+        self.async_on_remove(self._async_cancel_deferred_write)
 
         # First try to get current value from coordinator
-        if self.coordinator.data and isinstance(self.coordinator.data, dict):
-            self._attr_native_value = self.coordinator.data.get(
-                self.entity_description.key
+        if self.coordinator.data is not None:
+            self._attr_native_value, self._attr_extra_state_attributes = (
+                self._values_from_snapshot(self.coordinator.data)
             )
 
         # If no current value, try to restore last state
@@ -122,132 +385,145 @@ class UDElectricalSensor(
                 except (ValueError, TypeError):
                     self._attr_native_value = last_state.state
 
+        self._async_write_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the value, attributes or availability changed.
+
+        Changes to the attributes alone are written at most once per
+        attribute interval.
+        """
+        if (snapshot := self.coordinator.data) is None:
+            value = self._attr_native_value
+            attributes = self._attr_extra_state_attributes
+        else:
+            value, attributes = self._values_from_snapshot(snapshot)
+
+        if (
+            value == self._attr_native_value
+            and self.available == self._written_available
+        ):
+            if attributes == self._attr_extra_state_attributes:
+                return
+            delay = self._written_at + self._attribute_interval - time.monotonic()
+            if delay > 0:
+                # Postponed rather than dropped: unchanged data does not call
+                # back, so the attributes would otherwise stay stale.
+                self._pending_attributes = attributes
+                if self._cancel_deferred_write is None:
+                    self._cancel_deferred_write = async_call_later(
+                        self.hass,
+                        delay,
+                        HassJob(self._async_write_deferred, cancel_on_shutdown=True),
+                    )
+                return
+
+        self._attr_native_value = value
+        self._attr_extra_state_attributes = attributes
+        self._async_write_state()
+
+    @callback
+    def _async_write_deferred(self, _now: datetime) -> None:
+        """Write the attributes postponed by the attribute interval."""
+        self._cancel_deferred_write = None
+        if self._pending_attributes is not None:
+            self._attr_extra_state_attributes = self._pending_attributes
+            self._async_write_state()
+
+    @callback
+    def _async_cancel_deferred_write(self) -> None:
+        """Drop a postponed attribute write."""
+        self._pending_attributes = None
+        if self._cancel_deferred_write is not None:
+            self._cancel_deferred_write()
+            self._cancel_deferred_write = None
+
+    @callback
+    def _async_write_state(self) -> None:
+        """Write the state and remember what was written."""
+        self._async_cancel_deferred_write()
+        self._written_available = self.available
+        self._written_at = time.monotonic()
         self.async_write_ha_state()
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any] | None:
-        """Return the state attributes."""
-        now = datetime.now()
-        attributes = {
-            "For": now.strftime("%B, %Y"),  # Full month name (e.g., "January")
-        }
-
-        # Add coordinator data timestamp if available
-        if self.coordinator.data and isinstance(self.coordinator.data, dict):
-            if "last_updated" in self.coordinator.data:
-                attributes["data_last_updated"] = self.coordinator.data["last_updated"]
-
-        # Add entity-specific attributes based on sensor type
-        if self.entity_description.key == "actual_price":
-            # For the actual_price sensor, include today/yesterday values
-            if (
-                self.coordinator.data
-                and isinstance(self.coordinator.data, dict)
-                and isinstance(self.coordinator.data.get("today"), dict)
-                and isinstance(self.coordinator.data.get("yesterday"), dict)
-            ):
-                yesterday_data = self.coordinator.data.get("yesterday")
-                today_data = self.coordinator.data.get("today")
-
-                if yesterday_data and isinstance(yesterday_data, dict):
-                    yesterday_actual_price = yesterday_data.get("actual_price")
-                    if yesterday_actual_price is not None:
-                        attributes["yesterday"] = yesterday_actual_price
-
-                if today_data and isinstance(today_data, dict):
-                    today_actual_price = today_data.get("actual_price")
-                    if today_actual_price is not None:
-                        attributes["today"] = today_actual_price
-
-        # Add entity-specific attributes based on sensor type
-        if self.entity_description.key == "unit_price":
-            # For the unit_price sensor, include today/yesterday values
-            if (
-                self.coordinator.data
-                and isinstance(self.coordinator.data, dict)
-                and isinstance(self.coordinator.data.get("today"), dict)
-                and isinstance(self.coordinator.data.get("yesterday"), dict)
-            ):
-                yesterday_data = self.coordinator.data.get("yesterday")
-                today_data = self.coordinator.data.get("today")
-
-                if yesterday_data and isinstance(yesterday_data, dict):
-                    yesterday_unit_price = yesterday_data.get("unit_price")
-                    if yesterday_unit_price is not None:
-                        attributes["yesterday"] = yesterday_unit_price
-
-                if today_data and isinstance(today_data, dict):
-                    today_unit_price = today_data.get("unit_price")
-                    if today_unit_price is not None:
-                        attributes["today"] = today_unit_price
-
-        # Add entity-specific attributes based on sensor type
-        if self.entity_description.key == "consumption":
-            # For the consumption sensor, include today/yesterday values
-            if (
-                self.coordinator.data
-                and isinstance(self.coordinator.data, dict)
-                and isinstance(self.coordinator.data.get("today"), dict)
-                and isinstance(self.coordinator.data.get("yesterday"), dict)
-            ):
-                yesterday_data = self.coordinator.data.get("yesterday")
-                today_data = self.coordinator.data.get("today")
-
-                if yesterday_data and isinstance(yesterday_data, dict):
-                    yesterday_consumption = yesterday_data.get("consumption")
-                    if yesterday_consumption is not None:
-                        attributes["yesterday"] = yesterday_consumption
-
-                if today_data and isinstance(today_data, dict):
-                    today_consumption = today_data.get("consumption")
-                    if today_consumption is not None:
-                        attributes["today"] = today_consumption
-
-        return attributes
-
-    def _convert_to_float(self, value: str | float | None) -> float | None:
-        """Convert a value to float, returning None if conversion fails."""
-        if value is None:
-            return None
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            return None
+    def _values_from_snapshot(
+        self, snapshot: UdelectricalSnapshot
+    ) -> tuple[Any, dict[str, Any]]:
+        """Return this sensor's value and attributes from the snapshot.
+
+        A month sensor keeps its last known value when the snapshot has no
+        value for it; other sensors report no value.
+        """
+        description = self.entity_description
+        period = snapshot.periods.get(description.granularity)
+        if description.granularity is Granularity.ROLLING:
+            source = snapshot.analytics
+        elif description.granularity is Granularity.FORECAST:
+            source = snapshot.forecast
+        elif description.granularity is Granularity.LIVE:
+            source = snapshot.live
+        else:
+            source = period
+        value = None if source is None else getattr(source, description.value_key)
+        if value is None and description.granularity is Granularity.MONTH:
+            # Keeps a restored month value; other periods without data have
+            # no value yet, e.g. today's right after midnight.
+            value = self._attr_native_value
+
+        attributes: dict[str, Any] = {}
+        if period is not None:
+            attributes["For"] = period.label
+        if snapshot.last_updated is not None:
+            attributes["data_last_updated"] = snapshot.last_updated
+        if snapshot.fetched_at:
+            attributes["fetched_at"] = snapshot.fetched_at
+        if description.granularity is Granularity.MONTH:
+            attributes.update(
+                snapshot.daily_attributes.get(description.value_key, {})
+            )
+        if description.granularity is Granularity.FORECAST and source is not None:
+            attributes["lower"] = getattr(source, f"{description.value_key}_low")
+            attributes["upper"] = getattr(source, f"{description.value_key}_high")
+        if description.key == "power" and snapshot.live is not None:
+            attributes["average_power"] = snapshot.live.average_power
+        return value, attributes
+
+
+class UDElectricalDiagnosticSensor(SensorEntity):
+    """Diagnostic sensor reporting request and update cycle metrics.
+
+    The state is written after every update cycle, also when the data did
+    not change or the update failed again, which do not notify coordinator
+    entities.
+    """
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    entity_description: UDElectricalDiagnosticSensorEntityDescription
+
+    def __init__(
+        self,
+        entry: ConfigEntry,
+        coordinator: UdelectricalCoordinator,
+        description: UDElectricalDiagnosticSensorEntityDescription,
+    ) -> None:
+        """Initialize the diagnostic sensor."""
+        self.coordinator = coordinator
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = _device_info(entry)
+
+    async def async_added_to_hass(self) -> None:
+        """Write the state after each update cycle."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, self.coordinator.metrics_signal, self.async_write_ha_state
+            )
+        )
 
     @property
-    def native_value(self) -> float | None:
-        """Return the state of the sensor."""
-        # Always try coordinator data first
-        if self.coordinator.data and isinstance(self.coordinator.data, dict):
-            if self.entity_description.key == "saved":
-                # Calculate the difference between unit_price and actual_price
-                unit_price = self._convert_to_float(
-                    self.coordinator.data.get("unit_price")
-                )
-                actual_price = self._convert_to_float(
-                    self.coordinator.data.get("actual_price")
-                )
-                consumption = self._convert_to_float(
-                    self.coordinator.data.get("consumption")
-                )
-                if (
-                    unit_price is not None
-                    and actual_price is not None
-                    and consumption is not None
-                ):
-                    self._attr_native_value = (
-                        unit_price * consumption - actual_price * consumption
-                    )
-                    return self._attr_native_value
-            else:
-                value = self._convert_to_float(
-                    self.coordinator.data.get(self.entity_description.key)
-                )
-                if value is not None:
-                    self._attr_native_value = value
-                    return self._attr_native_value
-
-        # Fall back to stored value if available
-        if isinstance(self._attr_native_value, (int, float)):
-            return float(self._attr_native_value)
-        return None
+    def native_value(self) -> float | int | None:
+        """Return the current metric value."""
+        return self.entity_description.value_fn(self.coordinator.api.metrics)
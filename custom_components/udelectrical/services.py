@@ -0,0 +1,95 @@
+"""Services for the udelectrical integration."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from datetime import datetime
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .api import CannotConnect, InvalidAuth
+from .const import ATTR_CONFIG_ENTRY_ID, DOMAIN
+from .models import Granularity, PeriodValues
+
+SERVICE_GET_STATISTICS = "get_statistics"
+
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_GRANULARITY = "granularity"
+
+GET_STATISTICS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_START): cv.date,
+        vol.Required(ATTR_END): cv.date,
+        vol.Optional(ATTR_GRANULARITY, default=Granularity.DAY): vol.All(
+            vol.In([Granularity.DAY, Granularity.MONTH]), Granularity
+        ),
+    }
+)
+
+
+async def _async_get_statistics(call: ServiceCall) -> ServiceResponse:
+    """Return the day or month statistics of a date range."""
+    hass = call.hass
+    entry = hass.config_entries.async_get_entry(call.data[ATTR_CONFIG_ENTRY_ID])
+    if (
+        entry is None
+        or entry.domain != DOMAIN
+        or entry.state is not ConfigEntryState.LOADED
+    ):
+        raise ServiceValidationError(
+            translation_domain=DOMAIN, translation_key="entry_not_loaded"
+        )
+    start = call.data[ATTR_START]
+    end = call.data[ATTR_END]
+    if start > end:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN, translation_key="invalid_range"
+        )
+
+    granularity: Granularity = call.data[ATTR_GRANULARITY]
+    try:
+        records = await entry.runtime_data.ranges.async_get(
+            granularity, start, end, datetime.now().date()
+        )
+    except (CannotConnect, InvalidAuth) as err:
+        raise HomeAssistantError(
+            translation_domain=DOMAIN, translation_key="cannot_connect"
+        ) from err
+
+    statistics = []
+    for period, record in records.items():
+        if (values := PeriodValues.from_records(period, [record])) is not None:
+            row = asdict(values)
+            row["period"] = row.pop("label")
+            statistics.append(row)
+    return {
+        "granularity": granularity,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "statistics": statistics,
+    }
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the udelectrical services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_STATISTICS,
+        _async_get_statistics,
+        schema=GET_STATISTICS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,198 @@
+"""Long-term statistics import for the udelectrical integration."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import aclosing
+from datetime import date, timedelta
+import logging
+from typing import Any
+
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+)
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import CannotConnect, UdelectricalApi
+from .const import DOMAIN
+from .history import DAY_FORMAT
+from .models import StatisticsRow
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# Number of days written to the recorder and checkpointed per batch.
+PAGE_DAYS = 92
+
+_PRICE_KEYS = ("unit_price", "actual_price")
+
+
+class UdelectricalStatisticsImporter:
+    """Import daily statistics into the recorder as external statistics.
+
+    Days are written with one async_add_external_statistics call per
+    statistic and batch. A checkpoint with the last imported day and the
+    running consumption sum is saved after each batch, so an interrupted
+    import resumes where it stopped.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, api: UdelectricalApi, key: str, name: str
+    ) -> None:
+        """Initialize the importer."""
+        self._hass = hass
+        self._api = api
+        self._key = key
+        self._name = name
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.statistics.{key}"
+        )
+        self._lock = asyncio.Lock()
+        self._checkpoint: date | None = None
+        self._sum = 0.0
+        self._loaded = False
+
+    def _statistic_id(self, key: str) -> str:
+        """Return the external statistic id for a key."""
+        return f"{DOMAIN}:{self._key}_{key}"
+
+    def _metadata(self, key: str) -> StatisticMetaData:
+        """Return the statistic metadata for a key."""
+        if key == "consumption":
+            return StatisticMetaData(
+                mean_type=StatisticMeanType.NONE,
+                has_sum=True,
+                name=f"{self._name} Consumption",
+                source=DOMAIN,
+                statistic_id=self._statistic_id(key),
+                unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            )
+        return StatisticMetaData(
+            mean_type=StatisticMeanType.ARITHMETIC,
+            has_sum=False,
+            name=f"{self._name} {key.replace('_', ' ').title()}",
+            source=DOMAIN,
+            statistic_id=self._statistic_id(key),
+            unit_of_measurement="SEK/kWh",
+        )
+
+    async def _async_load(self) -> None:
+        """Load the resume checkpoint."""
+        if self._loaded:
+            return
+        if (data := await self._store.async_load()) is not None:
+            self._checkpoint = date.fromisoformat(data["date"])
+            self._sum = data["sum"]
+        self._loaded = True
+
+    def needs_import(self, end: date) -> bool:
+        """Return True if days up to end have not been imported yet."""
+        return not self._loaded or self._checkpoint is None or self._checkpoint < end
+
+    async def async_import(self, start: date, end: date) -> None:
+        """Import all days from start to end inclusive not yet imported.
+
+        The whole range is requested at once and streamed as compact rows;
+        they are handed to the recorder and checkpointed every PAGE_DAYS
+        days, so memory use does not grow with the length of the backfill.
+        The checkpoint only covers days received without a gap, so a day the
+        API returns late is still imported.
+        """
+        async with self._lock:
+            await self._async_load()
+            if self._checkpoint is not None:
+                start = max(start, self._checkpoint + timedelta(days=1))
+            if start > end:
+                return
+
+            batch = _Batch(self._sum)
+            # Each day's sum builds on the day before, so the import stops at
+            # the first missing day.
+            expected = start
+            try:
+                async with aclosing(
+                    self._api.async_stream_rows(
+                        "/api/statistics/by-day/"
+                        f"?start_date={start.strftime(DAY_FORMAT)}"
+                        f"&end_date={end.strftime(DAY_FORMAT)}",
+                        "date",
+                    )
+                ) as rows:
+                    async for row in rows:
+                        # Days are listed in order; a valid date field wins.
+                        period = expected
+                        if row.period:
+                            try:
+                                period = date.fromisoformat(row.period[:10])
+                            except ValueError:
+                                pass
+                        if period < expected:
+                            continue
+                        if period > expected or period > end:
+                            break
+                        batch.add(period, row)
+                        expected = period + timedelta(days=1)
+                        if batch.days >= PAGE_DAYS:
+                            await self._async_flush(batch, period)
+                            batch = _Batch(self._sum)
+            except CannotConnect as err:
+                _LOGGER.debug(
+                    "Statistics import paused after %s, will resume: %s",
+                    self._checkpoint,
+                    err,
+                )
+                return
+            if batch.days:
+                await self._async_flush(batch, expected - timedelta(days=1))
+
+    async def _async_flush(self, batch: _Batch, last: date) -> None:
+        """Hand a batch to the recorder and checkpoint up to last."""
+        if batch.consumption:
+            async_add_external_statistics(
+                self._hass, self._metadata("consumption"), batch.consumption
+            )
+        for key, stats in batch.prices.items():
+            if stats:
+                async_add_external_statistics(self._hass, self._metadata(key), stats)
+
+        self._sum = batch.sum
+        self._checkpoint = last
+        await self._store.async_save({"date": last.isoformat(), "sum": self._sum})
+        _LOGGER.debug("Imported udelectrical statistics up to %s", last)
+
+
+class _Batch:
+    """Statistics converted from streamed rows, not yet written."""
+
+    def __init__(self, running_sum: float) -> None:
+        """Initialize an empty batch continuing from running_sum."""
+        self.sum = running_sum
+        self.days = 0
+        self.consumption: list[StatisticData] = []
+        self.prices: dict[str, list[StatisticData]] = {
+            key: [] for key in _PRICE_KEYS
+        }
+
+    def add(self, period: date, row: StatisticsRow) -> None:
+        """Convert the row of one day."""
+        self.days += 1
+        period_start = dt_util.start_of_local_day(period)
+        if row.consumption is not None:
+            self.sum += row.consumption
+            self.consumption.append(
+                StatisticData(start=period_start, state=row.consumption, sum=self.sum)
+            )
+        for key in _PRICE_KEYS:
+            if (price := getattr(row, key)) is not None:
+                self.prices[key].append(
+                    StatisticData(start=period_start, mean=price, min=price, max=price)
+                )
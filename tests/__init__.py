@@ -0,0 +1,35 @@
+"""Tests for the udelectrical integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import CONF_API_KEY, CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from custom_components.udelectrical.const import CONF_SSL, DOMAIN
+
+from .backend import API_KEY, StandInBackend
+
+
+async def async_add_entry(
+    hass: HomeAssistant,
+    backend: StandInBackend,
+    host: str | None = None,
+    **options: Any,
+) -> MockConfigEntry:
+    """Add and set up a config entry, by default for a new stand-in host."""
+    if host is None:
+        host = await backend.async_add_host()
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=host,
+        data={CONF_HOST: host, CONF_API_KEY: API_KEY, CONF_SSL: False},
+        options=options,
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
@@ -0,0 +1,248 @@
+"""Local stand-in for the udElectrical API, served by aiohttp."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+import hashlib
+import json
+import random
+import socket
+from typing import Any
+
+from aiohttp import web
+
+API_KEY = "test-api-key"
+
+
+@dataclass(slots=True)
+class BackendConfig:
+    """Behaviour of the stand-in API.
+
+    latency is added to every response, in seconds. padding adds that many
+    bytes to each statistics record, so payload sizes can be scaled. A share
+    error_rate of the requests is answered with error_status instead.
+    """
+
+    latency: float = 0.0
+    padding: int = 0
+    error_rate: float = 0.0
+    error_status: int = 503
+    # Answer /api/consumption/latest as server-sent events when asked for.
+    stream: bool = True
+    seed: int = 0
+
+
+def _day_consumption(day: date) -> float:
+    """Return the base consumption of a day, in kWh."""
+    return 8.0 + day.toordinal() % 7 * 1.5
+
+
+class StandInBackend:
+    """Serve /api/status, the statistics endpoints and the latest reading.
+
+    Statistics are generated from the date, so every range is consistent
+    between the day and month endpoints. advance() moves the latest reading
+    forward and adds consumption to today, like a meter ingestion would.
+    Each call to async_add_host() serves the API on another local port, so
+    several config entries can use distinct hosts.
+
+    Days after ingested_until, and days or months listed in missing, are
+    left out of the statistics, like data the API has not ingested yet.
+    day_body replaces the body of every by-day response when set, and urls
+    lists the path and query of every request.
+    """
+
+    def __init__(self, config: BackendConfig | None = None) -> None:
+        """Initialize the stand-in."""
+        self.config = config or BackendConfig()
+        self.requests: Counter[str] = Counter()
+        self.stream_connects = 0
+        self.latest = "2026-01-01T00:00:00+00:00"
+        self.ingested_until: date | None = None
+        self.missing: set[str] = set()
+        self.day_body: bytes | None = None
+        self.urls: list[str] = []
+        self._extra = 0.0
+        self._random = random.Random(self.config.seed)
+        self._streams: set[asyncio.Queue[str | None]] = set()
+        self._stream_changed = asyncio.Condition()
+        self._app = web.Application()
+        self._app.router.add_get("/api/status", self._handle_status)
+        self._app.router.add_get("/api/statistics/by-day/", self._handle_days)
+        self._app.router.add_get("/api/statistics/by-month/", self._handle_months)
+        self._app.router.add_get("/api/consumption/latest", self._handle_latest)
+        self._runner = web.AppRunner(self._app, handle_signals=False)
+
+    async def async_start(self) -> None:
+        """Start serving."""
+        await self._runner.setup()
+
+    async def async_stop(self) -> None:
+        """End open streams and stop serving."""
+        self.drop_streams()
+        await self._runner.cleanup()
+
+    async def async_add_host(self) -> str:
+        """Serve the API on a new local port and return its host:port."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(("127.0.0.1", 0))
+        site = web.SockSite(self._runner, sock)
+        await site.start()
+        return f"127.0.0.1:{sock.getsockname()[1]}"
+
+    def advance(self, consumption: float = 0.5) -> str:
+        """Ingest a new reading adding consumption to today, in kWh."""
+        self._extra += consumption
+        self.latest = datetime.now().astimezone().isoformat()
+        return self.latest
+
+    def _ingested(self, day: date) -> bool:
+        """Return True if the statistics of a day are available."""
+        return (
+            self.ingested_until is None or day <= self.ingested_until
+        ) and day.isoformat() not in self.missing
+
+    def _record(self, day: date) -> dict[str, Any]:
+        """Return the statistics of a day."""
+        consumption = _day_consumption(day)
+        if day == date.today():
+            consumption += self._extra
+        return {
+            "date": day.isoformat(),
+            "unit_price": 1.2,
+            "actual_price": 0.9 + day.day % 3 * 0.1,
+            "consumption": round(consumption, 3),
+        }
+
+    def _with_padding(self, record: dict[str, Any]) -> dict[str, Any]:
+        """Return the record grown by the configured padding."""
+        if self.config.padding:
+            record["note"] = "x" * self.config.padding
+        return record
+
+    async def _async_prepare(self, request: web.Request) -> web.Response | None:
+        """Apply latency, errors and authentication; return an early response."""
+        self.requests[request.path] += 1
+        self.urls.append(request.path_qs)
+        if self.config.latency:
+            await asyncio.sleep(self.config.latency)
+        if request.headers.get("X-API-Key") != API_KEY:
+            return web.json_response({"detail": "Invalid API key"}, status=401)
+        if self.config.error_rate and self._random.random() < self.config.error_rate:
+            return web.json_response(
+                {"detail": "Unavailable"}, status=self.config.error_status
+            )
+        return None
+
+    @staticmethod
+    def _json(request: web.Request, data: Any) -> web.Response:
+        """Return data as JSON with an ETag, or 304 if the client has it."""
+        body = json.dumps(data).encode()
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(
+            body=body, content_type="application/json", headers={"ETag": etag}
+        )
+
+    async def _handle_status(self, request: web.Request) -> web.Response:
+        if (early := await self._async_prepare(request)) is not None:
+            return early
+        return self._json(request, {"status": "ok"})
+
+    async def _handle_days(self, request: web.Request) -> web.Response:
+        if (early := await self._async_prepare(request)) is not None:
+            return early
+        if self.day_body is not None:
+            return web.Response(body=self.day_body, content_type="application/json")
+        start = date.fromisoformat(request.query["start_date"])
+        end = min(date.fromisoformat(request.query["end_date"]), date.today())
+        records = []
+        day = start
+        while day <= end:
+            if self._ingested(day):
+                records.append(self._with_padding(self._record(day)))
+            day += timedelta(days=1)
+        return self._json(request, records)
+
+    async def _handle_months(self, request: web.Request) -> web.Response:
+        if (early := await self._async_prepare(request)) is not None:
+            return early
+        month = date.fromisoformat(f"{request.query['start_month']}-01")
+        end = date.fromisoformat(f"{request.query['end_month']}-01")
+        today = date.today()
+        records = []
+        while month <= end and month <= today:
+            days = []
+            day = month
+            while day.month == month.month and day <= today:
+                if self._ingested(day):
+                    days.append(self._record(day))
+                day += timedelta(days=1)
+            if not days or month.strftime("%Y-%m") in self.missing:
+                month = day
+                continue
+            consumption = sum(record["consumption"] for record in days)
+            records.append(
+                self._with_padding(
+                    {
+                        "month": month.strftime("%Y-%m"),
+                        "unit_price": 1.2,
+                        "actual_price": round(
+                            sum(r["actual_price"] * r["consumption"] for r in days)
+                            / consumption,
+                            4,
+                        ),
+                        "consumption": round(consumption, 3),
+                    }
+                )
+            )
+            month = day
+        return self._json(request, records)
+
+    async def _handle_latest(self, request: web.Request) -> web.StreamResponse:
+        if (early := await self._async_prepare(request)) is not None:
+            return early
+        if not (
+            self.config.stream
+            and "text/event-stream" in request.headers.get("Accept", "")
+        ):
+            return self._json(request, self.latest)
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        queue: asyncio.Queue[str | None] = asyncio.Queue()
+        async with self._stream_changed:
+            self.stream_connects += 1
+            self._streams.add(queue)
+            self._stream_changed.notify_all()
+        try:
+            while (text := await queue.get()) is not None:
+                await response.write(text.encode())
+        finally:
+            self._streams.discard(queue)
+        return response
+
+    async def async_wait_for_streams(self, connects: int) -> None:
+        """Wait until the stream has been opened connects times in total."""
+        async with self._stream_changed:
+            await self._stream_changed.wait_for(
+                lambda: self.stream_connects >= connects
+            )
+
+    def push(self, reading: Any) -> None:
+        """Send a reading as an event to every open stream."""
+        self.push_raw(f"data: {json.dumps(reading)}\n\n")
+
+    def push_raw(self, text: str) -> None:
+        """Send raw text to every open stream."""
+        for queue in self._streams:
+            queue.put_nowait(text)
+
+    def drop_streams(self) -> None:
+        """Close every open stream."""
+        for queue in self._streams:
+            queue.put_nowait(None)
@@ -0,0 +1,70 @@
+"""Benchmarks for the udelectrical integration."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+BASELINES_PATH = Path(__file__).parent / "baselines.json"
+
+# Factor a result may be worse than its baseline before the benchmark fails;
+# timings vary more between machines than memory use does.
+TIME_TOLERANCE = 3.0
+MEMORY_TOLERANCE = 1.5
+
+
+class Baselines:
+    """Stored benchmark results to compare new results against.
+
+    With --update-baselines every result is stored as the new baseline
+    instead, keeping the tolerance already stored for it.
+    """
+
+    def __init__(self, path: Path, update: bool) -> None:
+        """Load the stored baselines."""
+        self._path = path
+        self._update = update
+        self._data: dict[str, dict[str, Any]] = (
+            json.loads(path.read_text()) if path.exists() else {}
+        )
+
+    def check(
+        self,
+        name: str,
+        value: float,
+        unit: str,
+        tolerance: float,
+        higher_is_better: bool = False,
+    ) -> None:
+        """Fail if value regressed beyond the tolerance of its baseline."""
+        if self._update:
+            stored = self._data.get(name, {})
+            self._data[name] = {
+                "value": float(f"{value:.4g}"),
+                "unit": unit,
+                "higher_is_better": higher_is_better,
+                "tolerance": stored.get("tolerance", tolerance),
+            }
+            return
+        if (baseline := self._data.get(name)) is None:
+            pytest.fail(f"No baseline for {name}, run with --update-baselines")
+        if higher_is_better:
+            limit = baseline["value"] / baseline["tolerance"]
+            regressed = value < limit
+        else:
+            limit = baseline["value"] * baseline["tolerance"]
+            regressed = value > limit
+        assert not regressed, (
+            f"{name} regressed: {value:.6g} {unit}, baseline "
+            f"{baseline['value']:.6g} {unit}, limit {limit:.6g} {unit}"
+        )
+
+    def save(self) -> None:
+        """Write the baselines back if they were updated."""
+        if self._update:
+            self._path.write_text(
+                json.dumps(dict(sorted(self._data.items())), indent=2) + "\n"
+            )
@@ -0,0 +1,17 @@
+"""Fixtures for the udelectrical benchmarks."""
+
+from __future__ import annotations
+
+from collections.abc import Generator
+
+import pytest
+
+from . import BASELINES_PATH, Baselines
+
+
+@pytest.fixture(scope="session")
+def baselines(pytestconfig: pytest.Config) -> Generator[Baselines]:
+    """Return the stored baselines, saving updated ones after the session."""
+    baselines = Baselines(BASELINES_PATH, pytestconfig.getoption("update_baselines"))
+    yield baselines
+    baselines.save()
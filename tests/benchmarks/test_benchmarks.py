@@ -0,0 +1,176 @@
+"""Benchmarks for the udelectrical integration against the stand-in API."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+import gc
+import statistics
+import time
+import tracemalloc
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+
+from custom_components.udelectrical.api import UdelectricalApi
+from custom_components.udelectrical.const import DOMAIN
+from custom_components.udelectrical.coordinator import UdelectricalCoordinator
+
+from .. import async_add_entry
+from ..backend import API_KEY, StandInBackend
+from . import MEMORY_TOLERANCE, TIME_TOLERANCE, Baselines
+
+# Every cycle must reach the stand-in instead of the micro-cache.
+pytestmark = [pytest.mark.benchmark, pytest.mark.usefixtures("no_micro_cache")]
+
+CYCLES = 15
+WRITE_ROUNDS = 20
+
+_INTEGRATION_FILES = "*/custom_components/udelectrical/*"
+_TRACEBACK_FRAMES = 4
+
+
+async def _async_median_time(
+    func: Callable[[], Awaitable[Any]], runs: int = CYCLES
+) -> float:
+    """Return the median duration of func over runs calls, in seconds."""
+    durations = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await func()
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations)
+
+
+async def test_update_cycle_cold(
+    hass: HomeAssistant, backend: StandInBackend, baselines: Baselines
+) -> None:
+    """Measure a first cycle, which syncs the whole history lookback."""
+    host = await backend.async_add_host()
+    coordinators: list[UdelectricalCoordinator] = []
+
+    async def _async_cycle() -> None:
+        coordinator = UdelectricalCoordinator(
+            hass, UdelectricalApi(hass, host, API_KEY, ssl=False), host, "cold"
+        )
+        coordinators.append(coordinator)
+        assert await coordinator._async_update_data() is not None
+
+    duration = await _async_median_time(_async_cycle, runs=5)
+    for coordinator in coordinators:
+        await coordinator.async_shutdown()
+    baselines.check("update_cycle_cold", duration, "s", TIME_TOLERANCE)
+
+
+@pytest.mark.parametrize(
+    ("name", "advance", "latency", "padding"),
+    [
+        ("update_cycle_unchanged", False, 0.0, 0),
+        ("update_cycle_advanced", True, 0.0, 0),
+        ("update_cycle_advanced_slow_large", True, 0.02, 1024),
+    ],
+)
+async def test_update_cycle(
+    hass: HomeAssistant,
+    backend: StandInBackend,
+    baselines: Baselines,
+    name: str,
+    advance: bool,
+    latency: float,
+    padding: int,
+) -> None:
+    """Measure a steady-state cycle, with or without a new reading."""
+    entry = await async_add_entry(hass, backend)
+    coordinator: UdelectricalCoordinator = entry.runtime_data
+    backend.config.latency = latency
+    backend.config.padding = padding
+
+    async def _async_cycle() -> None:
+        if advance:
+            backend.advance()
+        await coordinator._async_update_data()
+
+    duration = await _async_median_time(_async_cycle)
+    baselines.check(name, duration, "s", TIME_TOLERANCE)
+
+
+@pytest.mark.parametrize("entries", [1, 10])
+async def test_state_write_throughput(
+    hass: HomeAssistant, backend: StandInBackend, baselines: Baselines, entries: int
+) -> None:
+    """Measure the sensor state writes per second across config entries."""
+    coordinators: list[UdelectricalCoordinator] = [
+        (await async_add_entry(hass, backend)).runtime_data for _ in range(entries)
+    ]
+    # Two snapshots per coordinator whose values differ, so every update
+    # writes the state of each sensor.
+    before = [coordinator.data for coordinator in coordinators]
+    backend.advance()
+    for coordinator in coordinators:
+        await coordinator.async_refresh()
+    after = [coordinator.data for coordinator in coordinators]
+    assert all(
+        old is not None and new is not None and old.periods != new.periods
+        for old, new in zip(before, after, strict=True)
+    )
+
+    writes = 0
+
+    @callback
+    def _async_count(event: Event) -> None:
+        nonlocal writes
+        if event.data["entity_id"].startswith("sensor."):
+            writes += 1
+
+    unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _async_count)
+    started = time.perf_counter()
+    for round_ in range(WRITE_ROUNDS):
+        snapshots = after if round_ % 2 == 0 else before
+        for coordinator, snapshot in zip(coordinators, snapshots, strict=True):
+            coordinator.async_set_updated_data(snapshot)
+        await hass.async_block_till_done()
+    elapsed = time.perf_counter() - started
+    unsub()
+
+    assert writes >= WRITE_ROUNDS * entries
+    baselines.check(
+        f"state_writes_per_second_{entries}_entries",
+        writes / elapsed,
+        "writes/s",
+        TIME_TOLERANCE,
+        higher_is_better=True,
+    )
+
+
+async def test_memory_per_entry(
+    hass: HomeAssistant, backend: StandInBackend, baselines: Baselines
+) -> None:
+    """Measure the memory allocated by the integration for each config entry."""
+    entries = 10
+    # The first entry loads the integration and its platform.
+    await async_add_entry(hass, backend)
+    # Only allocations made from the integration's code are counted, so
+    # recorder and logging activity do not add noise.
+    filters = [tracemalloc.Filter(True, _INTEGRATION_FILES, all_frames=True)]
+    gc.collect()
+    tracemalloc.start(_TRACEBACK_FRAMES)
+    try:
+        before = tracemalloc.take_snapshot().filter_traces(filters)
+        # The one-off statistics import is left out; its memory is released
+        # once it finishes.
+        with patch.object(
+            UdelectricalCoordinator, "_async_schedule_statistics_import"
+        ):
+            for _ in range(entries):
+                await async_add_entry(hass, backend)
+        gc.collect()
+        after = tracemalloc.take_snapshot().filter_traces(filters)
+    finally:
+        tracemalloc.stop()
+
+    assert len(hass.config_entries.async_entries(DOMAIN)) == entries + 1
+    used = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    baselines.check("memory_per_entry", used / entries, "bytes", MEMORY_TOLERANCE)
@@ -0,0 +1,69 @@
+"""Fixtures for the udelectrical tests."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator, Generator
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.recorder import Recorder
+
+from .backend import BackendConfig, StandInBackend
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Register the benchmark options."""
+    parser.addoption(
+        "--benchmarks",
+        action="store_true",
+        help="run the benchmarks, which are skipped by default",
+    )
+    parser.addoption(
+        "--update-baselines",
+        action="store_true",
+        help="store the benchmark results as the new baselines",
+    )
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    """Skip the benchmarks unless they were asked for."""
+    if config.getoption("benchmarks"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks only run with --benchmarks")
+    for item in items:
+        if item.get_closest_marker("benchmark") is not None:
+            item.add_marker(skip)
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(
+    recorder_mock: Recorder, enable_custom_integrations: None
+) -> None:
+    """Enable the udelectrical integration and its recorder in every test."""
+
+
+@pytest.fixture
+def backend_config() -> BackendConfig:
+    """Return the behaviour of the stand-in API; override to change it."""
+    return BackendConfig()
+
+
+@pytest.fixture
+async def backend(
+    socket_enabled: None, backend_config: BackendConfig
+) -> AsyncGenerator[StandInBackend]:
+    """Serve the stand-in API on a local port."""
+    backend = StandInBackend(backend_config)
+    await backend.async_start()
+    yield backend
+    await backend.async_stop()
+
+
+@pytest.fixture
+def no_micro_cache() -> Generator[None]:
+    """Let a repeated request reach the stand-in instead of the micro-cache."""
+    with patch("custom_components.udelectrical.api._MICRO_CACHE_TTL", 0):
+        yield
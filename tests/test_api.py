@@ -0,0 +1,134 @@
+"""Tests for the udelectrical API client, against the stand-in API."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.udelectrical.api import CannotConnect, UdelectricalApi
+from custom_components.udelectrical.models import StatisticsRow
+
+from .backend import API_KEY, StandInBackend
+
+_DAYS_URL = "/api/statistics/by-day/?start_date=2026-10-01&end_date=2026-10-03"
+_RECORDS = [
+    {"date": "2026-10-01", "unit_price": 1.2, "actual_price": 0.9, "consumption": 8},
+    {"date": "2026-10-02", "note": "Ström €, ✓ 🔌", "consumption": 9.5},
+    {"date": "2026-10-03", "unit_price": None, "consumption": "11.0"},
+]
+_ROWS = [
+    StatisticsRow("2026-10-01", 1.2, 0.9, 8.0),
+    StatisticsRow("2026-10-02", None, None, 9.5),
+    StatisticsRow("2026-10-03", None, None, 11.0),
+]
+
+
+async def _async_stream_rows(
+    hass: HomeAssistant, backend: StandInBackend, rows: list[StatisticsRow]
+) -> None:
+    """Append the rows streamed from the stand-in's by-day body to rows."""
+    api = UdelectricalApi(hass, await backend.async_add_host(), API_KEY, ssl=False)
+    async for row in api.async_stream_rows(_DAYS_URL, "date"):
+        rows.append(row)
+
+
+async def test_clients_share_requests(
+    hass: HomeAssistant, backend: StandInBackend
+) -> None:
+    """Test clients of one host and key share requests, others do not."""
+    host = await backend.async_add_host()
+    backend.config.latency = 0.05
+    first = UdelectricalApi(hass, host, API_KEY, ssl=False)
+    second = UdelectricalApi(hass, host, API_KEY, ssl=False)
+    other_key = UdelectricalApi(hass, host, "other-key", ssl=False)
+
+    await asyncio.gather(first.authenticate(), second.authenticate())
+    assert backend.requests["/api/status"] == 1
+    # A new client within the micro-cache period, like a setup right after
+    # the config flow, reuses the response.
+    assert await UdelectricalApi(hass, host, API_KEY, ssl=False).authenticate()
+    assert backend.requests["/api/status"] == 1
+
+    assert not await other_key.authenticate()
+    assert backend.requests["/api/status"] == 2
+
+
+async def test_close_cancels_only_own_requests(
+    hass: HomeAssistant, backend: StandInBackend
+) -> None:
+    """Test closing a client cancels the requests it started, for every caller."""
+    host = await backend.async_add_host()
+    backend.config.latency = 0.5
+    first = UdelectricalApi(hass, host, API_KEY, ssl=False)
+    second = UdelectricalApi(hass, host, API_KEY, ssl=False)
+
+    started = asyncio.create_task(first._async_request("GET", "/api/status"))
+    await asyncio.sleep(0)
+    joined = asyncio.create_task(second._async_request("GET", "/api/status"))
+    await asyncio.sleep(0)
+    await second.async_close()
+    assert not started.done()
+
+    await first.async_close()
+    for task in (started, joined):
+        with pytest.raises(CannotConnect, match="cancelled"):
+            await task
+
+
+@pytest.mark.parametrize("chunk_bytes", [1, 7, 64 * 1024])
+async def test_stream_rows_across_chunks(
+    hass: HomeAssistant, backend: StandInBackend, chunk_bytes: int
+) -> None:
+    """Test records and multi-byte characters split across chunks are parsed."""
+    backend.day_body = json.dumps(_RECORDS, ensure_ascii=False, indent=1).encode()
+    rows: list[StatisticsRow] = []
+    with patch("custom_components.udelectrical.api._READ_CHUNK_BYTES", chunk_bytes):
+        await _async_stream_rows(hass, backend, rows)
+    assert rows == _ROWS
+
+
+async def test_stream_rows_truncated(
+    hass: HomeAssistant, backend: StandInBackend
+) -> None:
+    """Test a truncated array fails after the complete records."""
+    body = json.dumps(_RECORDS).encode()
+    backend.day_body = body[: body.index(b'{"date": "2026-10-03"') + 12]
+    rows: list[StatisticsRow] = []
+    with (
+        patch("custom_components.udelectrical.api._READ_CHUNK_BYTES", 16),
+        pytest.raises(CannotConnect, match="Invalid JSON"),
+    ):
+        await _async_stream_rows(hass, backend, rows)
+    assert rows == _ROWS[:2]
+
+
+@pytest.mark.parametrize("body", [b'{"detail": "Not found"}', b"", b"null"])
+async def test_stream_rows_not_an_array(
+    hass: HomeAssistant, backend: StandInBackend, body: bytes
+) -> None:
+    """Test a body that is not a JSON array is rejected."""
+    backend.day_body = body
+    with pytest.raises(CannotConnect, match="Invalid JSON"):
+        await _async_stream_rows(hass, backend, [])
+
+
+async def test_stream_rows_record_too_large(
+    hass: HomeAssistant, backend: StandInBackend
+) -> None:
+    """Test a record larger than the limit is rejected while it is read."""
+    backend.day_body = json.dumps(
+        [_RECORDS[0], {"date": "2026-10-02", "note": "x" * 300}]
+    ).encode()
+    rows: list[StatisticsRow] = []
+    with (
+        patch("custom_components.udelectrical.api._READ_CHUNK_BYTES", 16),
+        patch("custom_components.udelectrical.api._MAX_RECORD_BYTES", 128),
+        pytest.raises(CannotConnect, match="Invalid JSON"),
+    ):
+        await _async_stream_rows(hass, backend, rows)
+    assert rows == _ROWS[:1]
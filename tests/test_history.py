@@ -0,0 +1,138 @@
+"""Tests for the udelectrical history sync, against the stand-in API."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.udelectrical.api import UdelectricalApi
+from custom_components.udelectrical.const import HISTORY_LOOKBACK_DAYS
+from custom_components.udelectrical.history import (
+    DAY_FORMAT,
+    MONTH_FORMAT,
+    UdelectricalHistory,
+    first_of_month,
+)
+
+from .backend import API_KEY, StandInBackend
+
+# A sync repeating the previous URL must reach the stand-in again.
+pytestmark = pytest.mark.usefixtures("no_micro_cache")
+
+
+@pytest.fixture
+async def history(hass: HomeAssistant, backend: StandInBackend) -> UdelectricalHistory:
+    """Return an empty history store for a new stand-in host."""
+    api = UdelectricalApi(hass, await backend.async_add_host(), API_KEY, ssl=False)
+    history = UdelectricalHistory(hass, api, "test")
+    await history.async_load()
+    return history
+
+
+def _day(days_ago: int) -> str:
+    """Return the key of the day days_ago days before today."""
+    return (date.today() - timedelta(days=days_ago)).strftime(DAY_FORMAT)
+
+
+def _month(day: date) -> str:
+    """Return the key of the month containing day."""
+    return day.strftime(MONTH_FORMAT)
+
+
+async def test_first_sync(
+    history: UdelectricalHistory, backend: StandInBackend
+) -> None:
+    """Test the first sync fetches the lookback, later ones only open days."""
+    today = date.today()
+
+    await history.async_sync_days(today)
+    await history.async_sync_months(today)
+    assert backend.urls == [
+        f"/api/statistics/by-day/?start_date={_day(HISTORY_LOOKBACK_DAYS)}"
+        f"&end_date={_day(0)}",
+        "/api/statistics/by-month/"
+        f"?start_month={_month(today - timedelta(days=HISTORY_LOOKBACK_DAYS))}"
+        f"&end_month={_month(today)}",
+    ]
+    assert len(history.days) == HISTORY_LOOKBACK_DAYS + 1
+
+    backend.urls.clear()
+    await history.async_sync_days(today)
+    await history.async_sync_months(today)
+    assert backend.urls == [
+        f"/api/statistics/by-day/?start_date={_day(1)}&end_date={_day(0)}",
+        f"/api/statistics/by-month/?start_month={_month(today - timedelta(days=1))}"
+        f"&end_month={_month(today)}",
+    ]
+
+
+async def test_gap_is_fetched_again(
+    history: UdelectricalHistory, backend: StandInBackend
+) -> None:
+    """Test the day cursor stops at a missing day until it is received."""
+    today = date.today()
+    backend.missing = {_day(10)}
+
+    await history.async_sync_days(today)
+    assert _day(10) not in history.days
+    assert _day(9) in history.days
+
+    backend.urls.clear()
+    await history.async_sync_days(today)
+    assert backend.urls == [
+        f"/api/statistics/by-day/?start_date={_day(10)}&end_date={_day(0)}"
+    ]
+
+    backend.missing.clear()
+    await history.async_sync_days(today)
+    assert _day(10) in history.days
+    backend.urls.clear()
+    await history.async_sync_days(today)
+    assert backend.urls == [
+        f"/api/statistics/by-day/?start_date={_day(1)}&end_date={_day(0)}"
+    ]
+
+
+async def test_missing_month_is_fetched_again(
+    history: UdelectricalHistory, backend: StandInBackend
+) -> None:
+    """Test the month cursor stops at a missing month until it is received."""
+    today = date.today()
+    gap = first_of_month(first_of_month(today - timedelta(days=1)) - timedelta(days=40))
+    backend.missing = {_month(gap)}
+
+    await history.async_sync_months(today)
+    backend.urls.clear()
+    await history.async_sync_months(today)
+    assert backend.urls == [
+        f"/api/statistics/by-month/?start_month={_month(gap)}"
+        f"&end_month={_month(today)}"
+    ]
+
+
+async def test_late_ingestion(
+    history: UdelectricalHistory, backend: StandInBackend
+) -> None:
+    """Test closed days the API ingests late are fetched once available."""
+    today = date.today()
+    backend.ingested_until = today - timedelta(days=5)
+
+    await history.async_sync_days(today)
+    assert _day(4) not in history.days
+    backend.urls.clear()
+    await history.async_sync_days(today)
+    assert backend.urls == [
+        f"/api/statistics/by-day/?start_date={_day(4)}&end_date={_day(0)}"
+    ]
+
+    backend.ingested_until = None
+    await history.async_sync_days(today)
+    assert {_day(4), _day(3), _day(2)} <= history.days.keys()
+    backend.urls.clear()
+    await history.async_sync_days(today)
+    assert backend.urls == [
+        f"/api/statistics/by-day/?start_date={_day(1)}&end_date={_day(0)}"
+    ]
@@ -0,0 +1,56 @@
+"""Tests for setting up udelectrical config entries."""
+
+from __future__ import annotations
+
+from homeassistant.config_entries import SOURCE_USER
+from homeassistant.const import CONF_API_KEY, CONF_HOST
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.udelectrical.const import CONF_SSL, DOMAIN
+
+from . import async_add_entry
+from .backend import API_KEY, StandInBackend
+
+
+async def test_entries_for_one_host(
+    hass: HomeAssistant, backend: StandInBackend
+) -> None:
+    """Test a host can be added again and identical entries share polling."""
+    first = await async_add_entry(hass, backend)
+    host = first.data[CONF_HOST]
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_HOST: host, CONF_API_KEY: API_KEY, CONF_SSL: False}
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    await hass.async_block_till_done()
+    second = hass.config_entries.async_get_entry(result["result"].entry_id)
+    assert second is not None
+    assert second.runtime_data is first.runtime_data
+
+    assert await hass.config_entries.async_remove(first.entry_id)
+    assert second.runtime_data.last_update_success
+    assert await hass.config_entries.async_unload(second.entry_id)
+
+
+async def test_reauth_updates_the_entry(
+    hass: HomeAssistant, backend: StandInBackend
+) -> None:
+    """Test re-authentication updates the key of the entry it was started for."""
+    await async_add_entry(hass, backend)
+    entry = await async_add_entry(hass, backend)
+
+    result = await entry.start_reauth_flow(hass)
+    assert result["step_id"] == "reauth_confirm"
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_API_KEY: API_KEY, CONF_SSL: False}
+    )
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "reauth_successful"
+    await hass.async_block_till_done()
+    assert entry.data[CONF_API_KEY] == API_KEY
+    assert await hass.config_entries.async_unload(entry.entry_id)
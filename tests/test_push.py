@@ -0,0 +1,174 @@
+"""Tests for the udelectrical push updates, served by the stand-in API."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from custom_components.udelectrical.api import CannotConnect, UdelectricalApi
+from custom_components.udelectrical.const import CONF_PUSH_UPDATES
+from custom_components.udelectrical.coordinator import UdelectricalCoordinator
+
+from . import async_add_entry
+from .backend import API_KEY, StandInBackend
+
+# A refresh right after setup must reach the stand-in again.
+pytestmark = pytest.mark.usefixtures("no_micro_cache")
+
+COORDINATOR_LOGGER = "custom_components.udelectrical.coordinator"
+
+
+async def _async_wait_for(predicate: Callable[[], bool]) -> None:
+    """Wait until predicate returns True."""
+    async with asyncio.timeout(5):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+async def _async_collect(api: UdelectricalApi, readings: list[Any]) -> None:
+    """Append every reading of the stream to readings."""
+    async for reading in api.async_stream_latest():
+        readings.append(reading)
+
+
+async def test_stream_framing(hass: HomeAssistant, backend: StandInBackend) -> None:
+    """Test events are parsed from the lines of the stream."""
+    api = UdelectricalApi(hass, await backend.async_add_host(), API_KEY, ssl=False)
+    readings: list[Any] = []
+    task = asyncio.create_task(_async_collect(api, readings))
+    await backend.async_wait_for_streams(1)
+
+    backend.push_raw(": keep-alive\n\n")
+    backend.push_raw('event: reading\nid: 7\ndata: "2026-10-17T10:00:00"\n\n')
+    backend.push_raw('data: {"reading":\r\ndata: 1}\r\n\r\n')
+    backend.push_raw('data: "split ')
+    backend.push_raw('event"\n\n')
+    backend.push_raw('data:"no space"\n\n')
+    await _async_wait_for(lambda: len(readings) == 4)
+    assert readings == [
+        "2026-10-17T10:00:00",
+        {"reading": 1},
+        "split event",
+        "no space",
+    ]
+
+    backend.drop_streams()
+    with pytest.raises(CannotConnect, match="closed"):
+        await task
+
+
+async def test_stream_invalid_json(
+    hass: HomeAssistant, backend: StandInBackend
+) -> None:
+    """Test an event that is not JSON ends the stream."""
+    api = UdelectricalApi(hass, await backend.async_add_host(), API_KEY, ssl=False)
+    task = asyncio.create_task(_async_collect(api, []))
+    await backend.async_wait_for_streams(1)
+
+    backend.push_raw("data: {broken\n\n")
+    with pytest.raises(CannotConnect, match="Invalid JSON"):
+        await task
+
+
+async def test_stream_not_supported(
+    hass: HomeAssistant, backend: StandInBackend
+) -> None:
+    """Test a backend answering with plain JSON is reported as unsupported."""
+    backend.config.stream = False
+    api = UdelectricalApi(hass, await backend.async_add_host(), API_KEY, ssl=False)
+
+    with pytest.raises(CannotConnect, match="not supported"):
+        await _async_collect(api, [])
+
+
+async def test_push_updates_sensors(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    backend: StandInBackend,
+) -> None:
+    """Test a pushed reading is applied and refreshes the statistics."""
+    entry = await async_add_entry(hass, backend, **{CONF_PUSH_UPDATES: True})
+    coordinator: UdelectricalCoordinator = entry.runtime_data
+    entity_id = entity_registry.async_get_entity_id(
+        "sensor", "udelectrical", f"{entry.entry_id}_consumption"
+    )
+    assert entity_id is not None
+    consumption = float(hass.states.get(entity_id).state)
+    await backend.async_wait_for_streams(1)
+    month_requests = backend.requests["/api/statistics/by-month/"]
+
+    reading = backend.advance(1.0)
+    backend.push(reading)
+    await _async_wait_for(
+        lambda: coordinator.data is not None
+        and coordinator.data.last_updated == reading
+    )
+    await hass.async_block_till_done()
+
+    assert backend.requests["/api/statistics/by-month/"] == month_requests + 1
+    assert float(hass.states.get(entity_id).state) == pytest.approx(consumption + 1)
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_push_reconnects_with_backoff(
+    hass: HomeAssistant, backend: StandInBackend, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test the stream is reopened with exponential backoff, reset on data."""
+    caplog.set_level(logging.DEBUG, logger=COORDINATOR_LOGGER)
+
+    def _delays() -> list[float]:
+        return [
+            record.args[0]
+            for record in caplog.records
+            if record.name == COORDINATOR_LOGGER
+            and record.msg.startswith("Push stream unavailable")
+        ]
+
+    backend.config.stream = False
+    with (
+        patch("custom_components.udelectrical.coordinator.PUSH_RETRY_MIN", 0.01),
+        patch("custom_components.udelectrical.coordinator.PUSH_RETRY_MAX", 0.04),
+    ):
+        entry = await async_add_entry(hass, backend, **{CONF_PUSH_UPDATES: True})
+        await _async_wait_for(lambda: len(_delays()) >= 5)
+        assert _delays()[:5] == [0.01, 0.02, 0.04, 0.04, 0.04]
+
+        backend.config.stream = True
+        await backend.async_wait_for_streams(1)
+        backend.push(backend.advance())
+        await hass.async_block_till_done()
+        backend.drop_streams()
+        await backend.async_wait_for_streams(2)
+
+        delays = _delays()
+        assert delays[-1] == 0.01
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_polling_continues_while_stream_is_down(
+    hass: HomeAssistant, backend: StandInBackend
+) -> None:
+    """Test polling keeps the data current while the stream is unavailable."""
+    backend.config.stream = False
+    entry = await async_add_entry(hass, backend, **{CONF_PUSH_UPDATES: True})
+    coordinator: UdelectricalCoordinator = entry.runtime_data
+    assert coordinator.update_interval is not None
+
+    reading = backend.advance()
+    async_fire_time_changed(hass, dt_util.utcnow() + coordinator.update_interval)
+    await _async_wait_for(
+        lambda: coordinator.data is not None
+        and coordinator.data.last_updated == reading
+    )
+    assert backend.stream_connects == 0
+    assert await hass.config_entries.async_unload(entry.entry_id)
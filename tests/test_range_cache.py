@@ -0,0 +1,109 @@
+"""Tests for the udelectrical range cache, against the stand-in API."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Any
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.udelectrical.api import UdelectricalApi
+from custom_components.udelectrical.history import DAY_FORMAT
+from custom_components.udelectrical.models import Granularity
+from custom_components.udelectrical.range_cache import UdelectricalRangeCache
+
+from .backend import API_KEY, StandInBackend
+
+# A repeated range must reach the stand-in instead of the micro-cache.
+pytestmark = pytest.mark.usefixtures("no_micro_cache")
+
+
+@pytest.fixture
+async def api(hass: HomeAssistant, backend: StandInBackend) -> UdelectricalApi:
+    """Return a client for a new stand-in host."""
+    return UdelectricalApi(hass, await backend.async_add_host(), API_KEY, ssl=False)
+
+
+def _day(days_ago: int) -> date:
+    """Return the day days_ago days before today."""
+    return date.today() - timedelta(days=days_ago)
+
+
+def _days_url(start: int, end: int) -> str:
+    """Return the by-day URL from start to end days ago."""
+    return (
+        f"/api/statistics/by-day/?start_date={_day(start).strftime(DAY_FORMAT)}"
+        f"&end_date={_day(end).strftime(DAY_FORMAT)}"
+    )
+
+
+async def _async_get(
+    cache: UdelectricalRangeCache, start: int, end: int
+) -> dict[str, dict[str, Any]]:
+    """Return the days from start to end days ago."""
+    return await cache.async_get(
+        Granularity.DAY, _day(start), _day(end), date.today()
+    )
+
+
+async def test_missing_tail_is_fetched_again(
+    api: UdelectricalApi, backend: StandInBackend
+) -> None:
+    """Test closed days the API did not return yet are not cached."""
+    cache = UdelectricalRangeCache(api)
+    backend.ingested_until = _day(10)
+
+    assert len(await _async_get(cache, 20, 3)) == 11
+
+    backend.ingested_until = None
+    backend.urls.clear()
+    assert len(await _async_get(cache, 20, 3)) == 18
+    assert backend.urls == [_days_url(9, 3)]
+
+    backend.urls.clear()
+    await _async_get(cache, 20, 3)
+    assert backend.urls == []
+
+
+async def test_gaps_between_ranges_are_fetched(
+    api: UdelectricalApi, backend: StandInBackend
+) -> None:
+    """Test only the days between cached ranges, and open days, are fetched."""
+    cache = UdelectricalRangeCache(api)
+    await _async_get(cache, 30, 25)
+    await _async_get(cache, 20, 15)
+
+    backend.urls.clear()
+    records = await _async_get(cache, 28, 0)
+    assert list(records) == [
+        _day(days_ago).strftime(DAY_FORMAT) for days_ago in range(28, -1, -1)
+    ]
+    assert sorted(backend.urls) == sorted(
+        [_days_url(24, 21), _days_url(14, 2), _days_url(1, 0)]
+    )
+
+    backend.urls.clear()
+    await _async_get(cache, 27, 2)
+    assert backend.urls == []
+
+
+async def test_least_recently_used_range_is_evicted(
+    api: UdelectricalApi, backend: StandInBackend
+) -> None:
+    """Test the least recently used range is evicted over the size budget."""
+    # Padded records make each five-day range about 5.5 kB.
+    backend.config.padding = 1000
+    cache = UdelectricalRangeCache(api, max_bytes=12_000)
+    await _async_get(cache, 30, 26)
+    await _async_get(cache, 20, 16)
+    await _async_get(cache, 30, 26)
+    await _async_get(cache, 10, 6)
+
+    backend.urls.clear()
+    await _async_get(cache, 30, 26)
+    await _async_get(cache, 10, 6)
+    assert backend.urls == []
+    await _async_get(cache, 20, 16)
+    assert backend.urls == [_days_url(20, 16)]
@@ -0,0 +1,45 @@
+"""Tests for the udelectrical sensors, against the stand-in API."""
+
+from __future__ import annotations
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.udelectrical.coordinator import UdelectricalCoordinator
+
+from . import async_add_entry
+from .backend import StandInBackend
+
+# Each refresh must reach the stand-in instead of the micro-cache.
+pytestmark = pytest.mark.usefixtures("no_micro_cache")
+
+
+async def test_diagnostic_sensors_update_every_cycle(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    backend: StandInBackend,
+) -> None:
+    """Test metric sensors are written even when the data is unchanged."""
+    entry = await async_add_entry(hass, backend)
+    entity_id = entity_registry.async_get_entity_id(
+        "sensor", "udelectrical", f"{entry.entry_id}_update_duration"
+    )
+    assert entity_id is not None
+    entity_registry.async_update_entity(entity_id, disabled_by=None)
+    await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator: UdelectricalCoordinator = entry.runtime_data
+    before = hass.states.get(entity_id)
+    assert before is not None
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    after = hass.states.get(entity_id)
+    assert after is not None
+    assert after.last_reported > before.last_reported
+    assert float(after.state) == pytest.approx(
+        coordinator.api.metrics.last_cycle_duration
+    )
+    assert await hass.config_entries.async_unload(entry.entry_id)